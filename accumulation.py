@@ -0,0 +1,56 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class Accumulation:
+    num_samples: int
+    channel_range: float
+    alpha: float = 0.1
+    num_voltage_bins: int = 128
+
+    def __post_init__(self):
+        self._columns = np.arange(self.num_samples)
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+
+        self.mean = np.zeros(self.num_samples)
+        self.exponential = np.zeros(self.num_samples)
+        self.minimum = np.full(self.num_samples, np.inf)
+        self.maximum = np.full(self.num_samples, -np.inf)
+
+        # Rows are voltage bins (lowest first), columns are sample indices.
+        self.persistence = np.zeros(
+            (self.num_voltage_bins, self.num_samples), dtype=np.uint32
+        )
+
+    @property
+    def voltage_edges(self):
+        return np.linspace(
+            -self.channel_range / 2, self.channel_range / 2, self.num_voltage_bins + 1
+        )
+
+    def update(self, frame):
+        frame = np.asarray(frame, dtype=float)
+        if frame.shape != (self.num_samples,):
+            raise ValueError(
+                f"Expected frame of {self.num_samples} samples, got {frame.shape}."
+            )
+
+        self.count += 1
+
+        self.mean += (frame - self.mean) / self.count
+        if self.count == 1:
+            self.exponential[:] = frame
+        else:
+            self.exponential += self.alpha * (frame - self.exponential)
+
+        np.minimum(self.minimum, frame, out=self.minimum)
+        np.maximum(self.maximum, frame, out=self.maximum)
+
+        bins = ((frame / self.channel_range + 0.5) * self.num_voltage_bins).astype(int)
+        np.clip(bins, 0, self.num_voltage_bins - 1, out=bins)
+        self.persistence[bins, self._columns] += 1
@@ -1,23 +1,40 @@
-import io
 import atexit
 
-from flask import Flask, Response, request
-from flask_cors import CORS
+from pathlib import Path
 
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
+from flask import Flask, Response, abort, request
+from flask_cors import CORS
 
 from device import Devices, Waveform, Pulse
+from encoding import FrameEncoder, encode_svg
+from batch import execute
+from compression import FrameCompressor, pack_words
+from replay import ReplayDevice, record_capture
 
 devices = Devices()
+encoder = None
 
 app = Flask(__name__)
+app.config["TRACE_DIRECTORY"] = Path(app.root_path) / "traces"
+app.config["CAPTURE_DIRECTORY"] = Path(app.root_path) / "captures"
 CORS(app)
 
 
+def confined_path(directory, path):
+    # Paths come from the query string of cross-origin GET requests, so they
+    # may only name files inside the configured directory.
+    if not path:
+        abort(400, "Missing path.")
+    directory = Path(directory).resolve()
+    resolved = (directory / path).resolve()
+    if resolved == directory or not resolved.is_relative_to(directory):
+        abort(400, f"Path {path!r} is outside {directory}.")
+    return resolved
+
+
 @app.route("/devices")
 def enumerate_devices():
-    devices.load()
+    devices.load(refresh="refresh" in request.args)
     return devices.available
 
 
@@ -28,12 +45,43 @@ def close_devices():
     return "Closed all devices."
 
 
+def frame_encoder():
+    global encoder
+    if encoder is None:
+        encoder = FrameEncoder()
+    return encoder
+
+
+@atexit.register
+def shutdown_encoder():
+    if encoder is not None:
+        encoder.shutdown()
+
+
 @app.route("/device/activate")
 def activate_device():
-    devices.activate(int(request.args.get("index")))
+    devices.activate(int(request.args.get("index")), request.args.get("profile"))
     return f"Activated device {devices.active.index} (handle: {devices.active.handle})."
 
 
+@app.route("/device/replay")
+def activate_replay():
+    device = ReplayDevice.from_capture(
+        confined_path(app.config["CAPTURE_DIRECTORY"], request.args.get("path")),
+        float(request.args.get("rate", 1)),
+        "loop" in request.args,
+    )
+    devices.attach(device)
+    return f"Replaying {device.path}."
+
+
+@app.route("/device/record")
+def record():
+    path = confined_path(app.config["CAPTURE_DIRECTORY"], request.args.get("path"))
+    record_capture(devices.active, path, int(request.args.get("frames")))
+    return f"Recorded {path}."
+
+
 @app.route("/device/deactivate")
 def deactivate_device():
     devices.deactivate()
@@ -57,21 +105,126 @@ def start():
     return "Started."
 
 
-def acquisition():
-    for figure in devices.active.acquire_plots():
-        image = io.BytesIO()
-        figure.savefig(image, format="svg")
+def svg_stream(images):
+    for image in images:
+        yield b"--frame\r\nContent-Type: image/svg+xml\r\n\r\n" + image + b"\r\n"
+
 
+def acquisition(figures):
+    return svg_stream(encode_svg(figure) for figure in figures)
+
+
+def traced_acquisition(device):
+    traces = {}
+
+    def frames():
+        for index, frame in enumerate(device.acquire_data()):
+            traces[index] = device.tracer.latest
+            yield frame
+
+    for index, image in frame_encoder().encode(device.frame_layout, frames()):
+        trace = traces.pop(index)
+        device.tracer.mark(trace, "render")
+        yield from svg_stream([image])
+        device.tracer.mark(trace, "send")
+
+
+@app.route("/device/acquire")
+def acquire():
+    return Response(
+        traced_acquisition(devices.active),
+        mimetype="multipart/x-mixed-replace; boundary=frame",
+    )
+
+
+def compressed_stream(device):
+    compressor = FrameCompressor(device.analog_acquisition.channel_range)
+    for analog_data, digital_data in device.acquire_data():
         yield (
             b"--frame\r\n"
-            b"Content-Type: image/svg+xml\r\n\r\n" + image.getvalue() + b"\r\n"
+            b"Content-Type: application/octet-stream\r\n\r\n"
+            + compressor.encode(
+                analog_data,
+                pack_words(digital_data) if device.acquire_digital else None,
+            )
+            + b"\r\n"
         )
 
 
-@app.route("/device/acquire")
-def acquire():
+@app.route("/device/acquire/compressed")
+def acquire_compressed():
     return Response(
-        acquisition(),
+        compressed_stream(devices.active),
+        mimetype="multipart/x-mixed-replace; boundary=frame",
+    )
+
+
+@app.route("/device/trace")
+def trace_summary():
+    return devices.active.tracer.summary()
+
+
+@app.route("/device/trace/start")
+def start_trace():
+    path = confined_path(
+        app.config["TRACE_DIRECTORY"], request.args.get("path", "trace.json")
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    devices.active.tracer.start_session(path)
+    return f"Tracing to {path}."
+
+
+@app.route("/device/trace/stop")
+def stop_trace():
+    return f"Wrote trace to {devices.active.tracer.stop_session()}."
+
+
+@app.route("/device/acquire/accumulated")
+def acquire_accumulated():
+    return Response(
+        acquisition(
+            devices.active.acquire_accumulated_plots(
+                int(request.args.get("frames", 10)),
+                float(request.args.get("alpha", 0.1)),
+                "block" in request.args,
+            )
+        ),
+        mimetype="multipart/x-mixed-replace; boundary=frame",
+    )
+
+
+def spectrum_arguments():
+    segment_length = request.args.get("segment")
+    return dict(
+        window=request.args.get("window", "hann"),
+        segment_length=int(segment_length) if segment_length else None,
+        overlap=float(request.args.get("overlap", 0.5)),
+    )
+
+
+@app.route("/device/spectrum/frequencies")
+def spectrum_frequencies():
+    return devices.active.spectrum(**spectrum_arguments()).frequencies.tolist()
+
+
+def spectrum_stream(spectra):
+    for spectrum in spectra:
+        yield (
+            b"--frame\r\n"
+            b"Content-Type: application/octet-stream\r\n\r\n"
+            + spectrum.magnitude.astype("<f4").tobytes()
+            + b"\r\n"
+        )
+
+
+@app.route("/device/spectrum")
+def acquire_spectrum():
+    return Response(
+        spectrum_stream(
+            devices.active.acquire_spectra(
+                int(request.args.get("batch", 8)), **spectrum_arguments()
+            )
+        ),
         mimetype="multipart/x-mixed-replace; boundary=frame",
     )
 
@@ -100,3 +253,17 @@ def stop_pulsing():
 def stop():
     devices.active.stop()
     return "Stopped."
+
+
+@app.route("/device/batch", methods=["POST"])
+def batch():
+    operations = request.get_json(silent=True)
+    # Reject malformed bodies before running anything on the device.
+    if not isinstance(operations, list) or not all(
+        isinstance(arguments, dict) for arguments in operations
+    ):
+        return {"error": "Expected a JSON list of operation objects."}, 400
+
+    results = execute(devices, operations)
+    status = 400 if results and "error" in results[-1] else 200
+    return results, status
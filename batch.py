@@ -0,0 +1,145 @@
+import time
+
+from itertools import islice
+
+import numpy as np
+
+from device import Waveform, Pulse
+from impedance import Impedance
+
+
+OPERATIONS = {}
+
+
+def operation(name):
+    def register(function):
+        OPERATIONS[name] = function
+        return function
+
+    return register
+
+
+@operation("activate")
+def activate(devices, index, profile=None):
+    devices.activate(index, profile)
+
+
+@operation("deactivate")
+def deactivate(devices):
+    devices.deactivate()
+
+
+# Starting configures the acquisitions for the waveform, so there is no
+# separate configure operation.
+@operation("start")
+def start(devices, channel, **waveform):
+    devices.active.start(channel, Waveform(**waveform))
+
+
+@operation("stop")
+def stop(devices):
+    devices.active.stop()
+
+
+@operation("pulse/start")
+def start_pulsing(devices, channel):
+    devices.active.start_pulsing(Pulse(channel=channel))
+
+
+@operation("pulse/stop")
+def stop_pulsing(devices, channel):
+    devices.active.stop_pulsing(Pulse(channel=channel))
+
+
+@operation("wait")
+def wait(devices, seconds):
+    time.sleep(seconds)
+
+
+def acquire_frames(devices, num_frames):
+    frames = devices.active.acquire_data()
+    try:
+        return list(islice(frames, num_frames))
+    finally:
+        frames.close()
+
+
+@operation("acquire")
+def acquire(devices, frames=1):
+    acquired = acquire_frames(devices, frames)
+    return {
+        "analog": [analog_data.tolist() for analog_data, _ in acquired],
+        "digital": [
+            [pin_data.tolist() for pin_data in digital_data]
+            for _, digital_data in acquired
+        ],
+    }
+
+
+@operation("measure")
+def measure(devices, frames=1):
+    analog_data = np.stack(
+        [analog_data for analog_data, _ in acquire_frames(devices, frames)]
+    )
+    minimum = analog_data.min(axis=1)
+    maximum = analog_data.max(axis=1)
+    return {
+        "mean": float(analog_data.mean()),
+        "rms": float(np.sqrt(np.mean(analog_data**2))),
+        "minimum": float(minimum.mean()),
+        "maximum": float(maximum.mean()),
+        "peak_to_peak": float((maximum - minimum).mean()),
+    }
+
+
+@operation("impedance/compensate")
+def compensate_impedance(devices, kind, frequencies, **impedance):
+    devices.active.measure_compensation(
+        kind, frequencies, Impedance(**impedance), refresh=True
+    )
+
+
+@operation("impedance")
+def sweep_impedance(
+    devices, frequencies, measurements=("impedance", "impedance_phase"), **impedance
+):
+    sweep = devices.active.impedance_sweep(
+        frequencies, measurements, Impedance(**impedance)
+    )
+    return {name: sweep[name].tolist() for name in sweep.dtype.names}
+
+
+@operation("impedance/stop")
+def stop_impedance(devices):
+    devices.active.stop_impedance()
+
+
+def execute(devices, operations):
+    """Run ``operations`` in order, stopping at the first failure.
+
+    Each operation is a mapping with an ``op`` name and that operation's
+    arguments; every executed operation reports its result (or error) and its
+    elapsed time in seconds.
+    """
+    results = []
+    for arguments in operations:
+        name = None
+
+        started = time.perf_counter()
+        try:
+            if not isinstance(arguments, dict):
+                raise ValueError(f"Expected an operation object, got {arguments!r}.")
+            arguments = dict(arguments)
+            name = arguments.pop("op", None)
+            if name not in OPERATIONS:
+                raise ValueError(f"Unknown operation {name!r}.")
+            result = {"op": name, "result": OPERATIONS[name](devices, **arguments)}
+        except Exception as error:  # Reported to the caller, not raised.
+            result = {"op": name, "error": str(error)}
+        result["elapsed"] = time.perf_counter() - started
+
+        results.append(result)
+        if "error" in result:
+            break
+
+    return results
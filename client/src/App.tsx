@@ -1,4 +1,5 @@
 import { useEffect, useState } from 'react'
+import CompressedAcquisition from './CompressedAcquisition'
 import './App.css'
 
 interface Device {
@@ -43,6 +44,8 @@ function App() {
   const [pulsing, setPulsing] = useState<boolean>(false);
   const [pulse, setPulse] = useState<Pulse>({ channel: 1 });
 
+  const [acquisitionView, setAcquisitionView] = useState<"images" | "compressed">("images");
+
   useEffect(() => {
     fetch("http://127.0.0.1:5000/devices")
       .then((response) => response.json())
@@ -150,7 +153,17 @@ function App() {
               </div>
               <div className="stack">
                 <h2>Acquisition</h2>
-                <img width={640} height={480} src={generating ? "http://127.0.0.1:5000/device/acquire" : ""}></img>
+                <label>
+                  View:{" "}
+                  <select value={acquisitionView} onChange={(event) => setAcquisitionView(event.target.value as "images" | "compressed")}>
+                    <option value="images">Images</option>
+                    <option value="compressed">Compressed</option>
+                  </select>
+                </label>
+                {acquisitionView === "images"
+                  ? <img width={640} height={480} src={generating ? "http://127.0.0.1:5000/device/acquire" : ""}></img>
+                  : generating && <CompressedAcquisition url="http://127.0.0.1:5000/device/acquire/compressed" width={640} height={480} />
+                }
               </div>
             </div>
           }
@@ -0,0 +1,73 @@
+import { useEffect, useRef } from 'react'
+import { DecodedFrame, FrameDecoder, readFrames } from './compression'
+
+interface CompressedAcquisitionProps {
+  url: string,
+  width: number,
+  height: number,
+  numDigitalPins?: number
+}
+
+function drawFrame(canvas: HTMLCanvasElement, frame: DecodedFrame, numDigitalPins: number) {
+  const context = canvas.getContext("2d");
+  if (context === null) return;
+
+  const { width, height } = canvas;
+  const analogHeight = frame.digital ? (height * 2) / 3 : height;
+  context.clearRect(0, 0, width, height);
+
+  // Analog samples span the channel range, centred on 0 V.
+  context.strokeStyle = "#1f77b4";
+  context.beginPath();
+  frame.analog.forEach((value, index) => {
+    const x = (index / Math.max(1, frame.analog.length - 1)) * width;
+    const y = (0.5 - value / frame.channelRange) * analogHeight;
+    if (index === 0) context.moveTo(x, y);
+    else context.lineTo(x, y);
+  });
+  context.stroke();
+
+  if (!frame.digital) return;
+
+  // One lane per digital pin below the analog trace.
+  const digital = frame.digital;
+  const laneHeight = (height - analogHeight) / numDigitalPins;
+  context.strokeStyle = "#ff7f0e";
+  for (let pin = 0; pin < numDigitalPins; pin++) {
+    const top = analogHeight + pin * laneHeight;
+    context.beginPath();
+    digital.forEach((word, index) => {
+      const x = (index / Math.max(1, digital.length - 1)) * width;
+      const y = top + (((word >> pin) & 1) ? 0.2 : 0.8) * laneHeight;
+      if (index === 0) context.moveTo(x, y);
+      else context.lineTo(x, y);
+    });
+    context.stroke();
+  }
+}
+
+function CompressedAcquisition({ url, width, height, numDigitalPins = 2 }: CompressedAcquisitionProps) {
+  const canvasRef = useRef<HTMLCanvasElement>(null);
+
+  useEffect(() => {
+    const controller = new AbortController();
+    const decoder = new FrameDecoder();
+
+    const stream = async () => {
+      const response = await fetch(url, { signal: controller.signal });
+      if (!response.ok || response.body === null) return;
+      // Frames are delta-encoded, so they are decoded strictly in order.
+      for await (const buffer of readFrames(response.body)) {
+        const frame = await decoder.decode(buffer);
+        if (canvasRef.current !== null) drawFrame(canvasRef.current, frame, numDigitalPins);
+      }
+    };
+    stream().catch((error) => { if (!controller.signal.aborted) console.error(error) });
+
+    return () => controller.abort();
+  }, [url, numDigitalPins]);
+
+  return <canvas ref={canvasRef} width={width} height={height}></canvas>;
+}
+
+export default CompressedAcquisition
@@ -0,0 +1,154 @@
+// Decoder for the frames streamed by /device/acquire/compressed (see
+// compression.py on the server for the encoder and the header layout).
+
+const MAGIC = 'AD2Z'
+const HEADER_SIZE = 26
+const RUN_SIZE = 6
+
+const ANALOG_RAW = 0
+const ANALOG_DELTA = 2
+
+const DIGITAL_NONE = 0
+const DIGITAL_RAW = 1
+const DIGITAL_XOR_RLE = 3
+
+const ANALOG_LEVELS = (1 << 14) - 1
+
+// Compression streams are not in the DOM typings of the TypeScript version
+// the client is built with, so declare the part used here.
+declare const DecompressionStream: new (format: 'deflate') => TransformStream<Uint8Array, Uint8Array>
+
+export interface DecodedFrame {
+  analog: Float64Array
+  digital?: Uint16Array
+  channelRange: number
+}
+
+async function inflate (data: BlobPart): Promise<ArrayBuffer> {
+  const stream = new Blob([data]).stream().pipeThrough(new DecompressionStream('deflate'))
+  return await new Response(stream).arrayBuffer()
+}
+
+function runLengthDecode (data: Uint8Array, numSamples: number): Uint16Array {
+  const view = new DataView(data.buffer, data.byteOffset, data.byteLength)
+  const words = new Uint16Array(numSamples)
+  let position = 0
+  for (let offset = 0; offset < data.byteLength; offset += RUN_SIZE) {
+    const value = view.getUint16(offset, true)
+    const count = view.getUint32(offset + 2, true)
+    words.fill(value, position, position + count)
+    position += count
+  }
+  return words
+}
+
+// Frames are encoded against the previous frame, so decode them one at a
+// time and in the order they were received.
+export class FrameDecoder {
+  private previousCodes?: Int16Array
+  private previousWords?: Uint16Array
+
+  reset (): void {
+    this.previousCodes = undefined
+    this.previousWords = undefined
+  }
+
+  async decode (buffer: ArrayBuffer): Promise<DecodedFrame> {
+    const header = new DataView(buffer, 0, HEADER_SIZE)
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4))
+    if (magic !== MAGIC) throw new Error('Not a compressed frame.')
+
+    const analogEncoding = header.getUint8(4)
+    const digitalEncoding = header.getUint8(5)
+    const numAnalogSamples = header.getUint32(6, true)
+    const numDigitalSamples = header.getUint32(10, true)
+    const channelRange = header.getFloat32(14, true)
+    const analogLength = header.getUint32(18, true)
+    const digitalLength = header.getUint32(22, true)
+
+    // Copy payloads out so typed array views start on aligned offsets.
+    const analogPayload = new Uint8Array(buffer.slice(HEADER_SIZE, HEADER_SIZE + analogLength))
+    const digitalPayload = new Uint8Array(buffer.slice(HEADER_SIZE + analogLength, HEADER_SIZE + analogLength + digitalLength))
+
+    const analog = new Float64Array(numAnalogSamples)
+    if (analogEncoding === ANALOG_RAW) {
+      this.previousCodes = undefined
+      analog.set(new Float32Array(analogPayload.buffer))
+    } else {
+      const codes = new Int16Array(await inflate(analogPayload))
+      if (analogEncoding === ANALOG_DELTA) {
+        if (this.previousCodes === undefined) throw new Error('Delta frame received without a key frame.')
+        for (let i = 0; i < codes.length; i++) codes[i] += this.previousCodes[i]
+      }
+      this.previousCodes = codes
+      for (let i = 0; i < codes.length; i++) analog[i] = (codes[i] / ANALOG_LEVELS - 0.5) * channelRange
+    }
+
+    if (digitalEncoding === DIGITAL_NONE) return { analog, channelRange }
+
+    let digital: Uint16Array
+    if (digitalEncoding === DIGITAL_RAW) {
+      this.previousWords = undefined
+      digital = new Uint16Array(digitalPayload.buffer)
+    } else {
+      digital = runLengthDecode(digitalPayload, numDigitalSamples)
+      if (digitalEncoding === DIGITAL_XOR_RLE) {
+        if (this.previousWords === undefined) throw new Error('XOR frame received without a reference frame.')
+        for (let i = 0; i < digital.length; i++) digital[i] ^= this.previousWords[i]
+      }
+      this.previousWords = digital
+    }
+
+    return { analog, digital, channelRange }
+  }
+}
+
+function partHeadersEnd (data: Uint8Array): number {
+  for (let i = 0; i + 3 < data.byteLength; i++) {
+    if (data[i] === 13 && data[i + 1] === 10 && data[i + 2] === 13 && data[i + 3] === 10) return i + 4
+  }
+  return -1
+}
+
+// Splits a multipart/x-mixed-replace response into frames. Frames are sized
+// from their own header rather than by searching for the boundary, which may
+// occur inside the binary payload.
+export async function * readFrames (body: ReadableStream<Uint8Array>): AsyncGenerator<ArrayBuffer> {
+  const reader = body.getReader()
+  let buffered = new Uint8Array(0)
+
+  async function fill (): Promise<boolean> {
+    const { done, value } = await reader.read()
+    if (done) return false
+    const joined = new Uint8Array(buffered.byteLength + value.byteLength)
+    joined.set(buffered)
+    joined.set(value, buffered.byteLength)
+    buffered = joined
+    return true
+  }
+
+  try {
+    while (true) {
+      let start = partHeadersEnd(buffered)
+      while (start < 0) {
+        if (!await fill()) return
+        start = partHeadersEnd(buffered)
+      }
+      buffered = buffered.subarray(start)
+
+      while (buffered.byteLength < HEADER_SIZE) {
+        if (!await fill()) return
+      }
+      const header = new DataView(buffered.buffer, buffered.byteOffset, HEADER_SIZE)
+      const size = HEADER_SIZE + header.getUint32(18, true) + header.getUint32(22, true)
+      while (buffered.byteLength < size) {
+        if (!await fill()) return
+      }
+
+      yield buffered.slice(0, size).buffer
+      buffered = buffered.subarray(size)
+    }
+  } finally {
+    await reader.cancel().catch(() => undefined)
+  }
+}
@@ -0,0 +1,202 @@
+import zlib
+import struct
+
+import numpy as np
+
+
+MAGIC = b"AD2Z"
+
+# magic, analog encoding, digital encoding, analog samples, digital samples,
+# channel range, analog payload length, digital payload length
+HEADER = struct.Struct("<4sBBIIfII")
+
+ANALOG_RAW = 0
+ANALOG_KEY = 1
+ANALOG_DELTA = 2
+
+DIGITAL_NONE = 0
+DIGITAL_RAW = 1
+DIGITAL_RLE = 2
+DIGITAL_XOR_RLE = 3
+
+# Native resolution of the Analog Discovery 2 scope ADC.
+ANALOG_BITS = 14
+ANALOG_LEVELS = (1 << ANALOG_BITS) - 1
+
+RUN = np.dtype([("value", "<u2"), ("count", "<u4")])
+
+
+def pack_words(digital_data):
+    words = np.zeros(len(digital_data[0]) if digital_data else 0, dtype=np.uint16)
+    for pin, pin_data in enumerate(digital_data):
+        words |= np.asarray(pin_data, dtype=np.uint16) << pin
+    return words
+
+
+def unpack_words(words, num_digital_pins):
+    return [((words >> pin) & 1).astype(float) for pin in range(num_digital_pins)]
+
+
+def quantize(analog_data, channel_range):
+    codes = np.rint((np.asarray(analog_data) / channel_range + 0.5) * ANALOG_LEVELS)
+    return np.clip(codes, 0, ANALOG_LEVELS).astype("<i2")
+
+
+def dequantize(codes, channel_range):
+    return (codes / ANALOG_LEVELS - 0.5) * channel_range
+
+
+def run_length_encode(words):
+    if words.size == 0:
+        return np.zeros(0, dtype=RUN)
+
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(words)) + 1))
+    runs = np.empty(starts.size, dtype=RUN)
+    runs["value"] = words[starts]
+    runs["count"] = np.diff(np.append(starts, words.size))
+    return runs
+
+
+def run_length_decode(runs):
+    return np.repeat(runs["value"], runs["count"]).astype(np.uint16)
+
+
+class FrameCompressor:
+    """Encodes successive frames against the previously sent frame.
+
+    Analog samples are quantized to 14 bits and delta-encoded, digital words
+    are XOR-ed with the previous words and run-length encoded. Each section
+    falls back to its raw form when encoding does not make it smaller, and a
+    raw analog section resets the reference so the next frame is a key frame.
+    """
+
+    def __init__(self, channel_range, level=6):
+        self.channel_range = channel_range
+        self.level = level
+        self.reset()
+
+    def reset(self):
+        self._previous_codes = None
+        self._previous_words = None
+
+    def encode(self, analog_data, digital_words=None):
+        analog_encoding, analog_payload = self._encode_analog(analog_data)
+
+        if digital_words is None:
+            digital_encoding, digital_payload = DIGITAL_NONE, b""
+            num_digital_samples = 0
+        else:
+            digital_words = np.asarray(digital_words, dtype="<u2")
+            digital_encoding, digital_payload = self._encode_digital(digital_words)
+            num_digital_samples = digital_words.size
+
+        return (
+            HEADER.pack(
+                MAGIC,
+                analog_encoding,
+                digital_encoding,
+                len(analog_data),
+                num_digital_samples,
+                self.channel_range,
+                len(analog_payload),
+                len(digital_payload),
+            )
+            + analog_payload
+            + digital_payload
+        )
+
+    def _encode_analog(self, analog_data):
+        raw = np.asarray(analog_data, dtype="<f4").tobytes()
+
+        codes = quantize(analog_data, self.channel_range)
+        if self._previous_codes is not None and (
+            self._previous_codes.size == codes.size
+        ):
+            encoding = ANALOG_DELTA
+            payload = zlib.compress(
+                (codes - self._previous_codes).tobytes(), self.level
+            )
+        else:
+            encoding = ANALOG_KEY
+            payload = zlib.compress(codes.tobytes(), self.level)
+
+        if len(payload) >= len(raw):
+            self._previous_codes = None
+            return ANALOG_RAW, raw
+
+        self._previous_codes = codes
+        return encoding, payload
+
+    def _encode_digital(self, digital_words):
+        raw = digital_words.tobytes()
+
+        if self._previous_words is not None and (
+            self._previous_words.size == digital_words.size
+        ):
+            encoding = DIGITAL_XOR_RLE
+            runs = run_length_encode(digital_words ^ self._previous_words)
+        else:
+            encoding = DIGITAL_RLE
+            runs = run_length_encode(digital_words)
+
+        payload = runs.tobytes()
+        if len(payload) >= len(raw):
+            self._previous_words = None
+            return DIGITAL_RAW, raw
+
+        self._previous_words = digital_words
+        return encoding, payload
+
+
+class FrameDecompressor:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._previous_codes = None
+        self._previous_words = None
+
+    def decode(self, frame):
+        (
+            magic,
+            analog_encoding,
+            digital_encoding,
+            num_analog_samples,
+            num_digital_samples,
+            channel_range,
+            analog_length,
+            digital_length,
+        ) = HEADER.unpack_from(frame)
+        if magic != MAGIC:
+            raise ValueError("Not a compressed frame.")
+
+        analog_payload = frame[HEADER.size : HEADER.size + analog_length]
+        digital_payload = frame[
+            HEADER.size + analog_length : HEADER.size + analog_length + digital_length
+        ]
+
+        if analog_encoding == ANALOG_RAW:
+            self._previous_codes = None
+            analog_data = np.frombuffer(analog_payload, dtype="<f4").astype(float)
+        else:
+            codes = np.frombuffer(zlib.decompress(analog_payload), dtype="<i2")
+            if analog_encoding == ANALOG_DELTA:
+                if self._previous_codes is None:
+                    raise ValueError("Delta frame received without a key frame.")
+                codes = codes + self._previous_codes
+            self._previous_codes = codes
+            analog_data = dequantize(codes, channel_range)
+
+        digital_words = None
+        if digital_encoding == DIGITAL_RAW:
+            self._previous_words = None
+            digital_words = np.frombuffer(digital_payload, dtype="<u2").copy()
+        elif digital_encoding in (DIGITAL_RLE, DIGITAL_XOR_RLE):
+            digital_words = run_length_decode(np.frombuffer(digital_payload, dtype=RUN))
+            if digital_encoding == DIGITAL_XOR_RLE:
+                if self._previous_words is None:
+                    raise ValueError("XOR frame received without a reference frame.")
+                digital_words ^= self._previous_words
+            self._previous_words = digital_words
+
+        return analog_data, digital_words
@@ -2,7 +2,7 @@ from typing import Optional
 
 import time
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from ctypes import (
     c_bool,
@@ -16,8 +16,6 @@ from ctypes import (
 )
 
 import numpy as np
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
 
 from dwfconstants import (
     hdwfNone,
@@ -26,8 +24,36 @@ from dwfconstants import (
     DwfTriggerSlopeRise,
     DwfStateDone,
     acqmodeScanShift,
+    acqmodeRecord,
+    acqmodeSingle,
+    trigsrcNone,
+    DECIAnalogInChannelCount,
+    DECIAnalogOutChannelCount,
+    DECIAnalogIOChannelCount,
+    DECIDigitalInChannelCount,
+    DECIDigitalOutChannelCount,
+    DECIDigitalIOChannelCount,
+    DECIAnalogInBufferSize,
+    DECIAnalogOutBufferSize,
+    DECIDigitalInBufferSize,
+    DECIDigitalOutBufferSize,
+    DwfAnalogImpedanceResistance,
+    DwfAnalogImpedanceReactance,
 )
 from utils import dwf
+from accumulation import Accumulation
+from spectrum import Spectrum
+from trigger import Trigger, SoftwareTrigger
+from encoding import FrameLayout, render_frame
+from tracing import Tracer
+from transitions import TransitionRecord
+from impedance import (
+    Impedance,
+    MEASUREMENTS,
+    COMPENSATIONS,
+    frequency_grid,
+    sweep_dtype,
+)
 
 
 @dataclass
@@ -66,6 +92,24 @@ class Pulse:
     channel: int
 
 
+BUFFER_PROFILES = ("analog_in", "analog_out", "digital_in", "digital_out")
+
+
+@dataclass
+class Configuration:
+    index: int
+    analog_in_channels: int
+    analog_out_channels: int
+    analog_io_channels: int
+    digital_in_channels: int
+    digital_out_channels: int
+    digital_io_channels: int
+    analog_in_buffer_size: int
+    analog_out_buffer_size: int
+    digital_in_buffer_size: int
+    digital_out_buffer_size: int
+
+
 @dataclass
 class Device:
     index: int
@@ -73,6 +117,7 @@ class Device:
     serial: str
     identifier: int
     revision: int
+    configurations: list[Configuration] = field(default_factory=list)
     num_digital_pins = 2
     acquire_digital = True
 
@@ -80,35 +125,53 @@ class Device:
         self.handle = c_int()
 
         self.is_open = False
+        self.configuration = None
         self.is_generating = False
         self.is_pulsing = False
 
         self.analog_acquisition = None
         self.digital_acquisition = None
 
+        self.tracer = Tracer()
+
+        self.impedance = None
+        self.impedance_compensations = {}
+
     @property
     def is_active(self):
-        self.is_generating or self.is_pulsing
+        return self.is_generating or self.is_pulsing
+
+    def select_configuration(self, profile):
+        if profile not in BUFFER_PROFILES:
+            raise ValueError(
+                f"Unknown buffer profile {profile!r}, expected one of {BUFFER_PROFILES}."
+            )
+        if not self.configurations:
+            raise AttributeError(f"No configurations known for device {self.index}.")
 
-    def open(self):
+        # max() keeps the first of equal candidates, preferring lower indices.
+        return max(
+            self.configurations,
+            key=lambda configuration: getattr(configuration, f"{profile}_buffer_size"),
+        )
+
+    def open(self, configuration: Optional[Configuration] = None):
         if self.is_open:
             raise AttributeError("Device already open.")
 
-        dwf.FDwfDeviceOpen(c_int(self.index), byref(self.handle))
+        if configuration is None:
+            dwf.FDwfDeviceOpen(c_int(self.index), byref(self.handle))
+        else:
+            dwf.FDwfDeviceConfigOpen(
+                c_int(self.index), c_int(configuration.index), byref(self.handle)
+            )
         if self.handle.value == hdwfNone.value:
             raise IOError(f"Failed to open device {self.index}.")
         self.is_open = True
+        self.configuration = configuration
 
-    def configure_acqusition(
-        self,
-        analog_acquisition: AnalogAcquisition,
-        digital_acquisition: Optional[DigitalAcquisition],
-    ):
-        if not self.is_open:
-            raise AttributeError("Cannot configure unopened device.")
-        if self.is_active:
-            raise AttributeError("Cannot configure active device.")
-
+    def configure_analog_in(self, analog_acquisition: AnalogAcquisition):
+        dwf.FDwfAnalogInAcquisitionModeSet(self.handle, acqmodeSingle)
         dwf.FDwfAnalogInChannelEnableSet(
             self.handle, c_int(analog_acquisition.channel), c_bool(True)
         )
@@ -120,6 +183,10 @@ class Device:
         dwf.FDwfAnalogInFrequencySet(
             self.handle, c_double(analog_acquisition.frequency)
         )
+        # The driver silently clamps the rate, so keep the one actually used.
+        analog_frequency = c_double()
+        dwf.FDwfAnalogInFrequencyGet(self.handle, byref(analog_frequency))
+        analog_acquisition.frequency = analog_frequency.value
         dwf.FDwfAnalogInBufferSizeSet(
             self.handle, c_int(analog_acquisition.num_samples)
         )
@@ -134,6 +201,18 @@ class Device:
 
         self.analog_acquisition = analog_acquisition
 
+    def configure_acqusition(
+        self,
+        analog_acquisition: AnalogAcquisition,
+        digital_acquisition: Optional[DigitalAcquisition],
+    ):
+        if not self.is_open:
+            raise AttributeError("Cannot configure unopened device.")
+        if self.is_generating:
+            raise AttributeError("Cannot configure active device.")
+
+        self.configure_analog_in(analog_acquisition)
+
         if digital_acquisition:
             digital_in_system_frequency = c_double()
             dwf.FDwfDigitalInInternalClockInfo(
@@ -144,10 +223,18 @@ class Device:
             dwf.FDwfDigitalInDividerSet(
                 self.handle,
                 c_int(
-                    int(digital_in_system_frequency.value)
-                    // digital_acquisition.frequency
+                    max(
+                        1,
+                        int(digital_in_system_frequency.value)
+                        // int(digital_acquisition.frequency),
+                    )
                 ),
             )
+            digital_in_divider = c_int()
+            dwf.FDwfDigitalInDividerGet(self.handle, byref(digital_in_divider))
+            digital_acquisition.frequency = (
+                digital_in_system_frequency.value / digital_in_divider.value
+            )
             dwf.FDwfDigitalInSampleFormatSet(self.handle, c_int(16))
             dwf.FDwfDigitalInBufferSizeSet(
                 self.handle, c_int(digital_acquisition.num_samples)
@@ -159,7 +246,7 @@ class Device:
     def configure_generation(self, channel, waveform: Waveform):
         if not self.is_open:
             raise AttributeError("Cannot configure unopened device.")
-        if self.is_active:
+        if self.is_generating:
             raise AttributeError("Cannot configure active device.")
 
         dwf.FDwfDeviceAutoConfigureSet(self.handle, c_int(0))
@@ -211,7 +298,7 @@ class Device:
     def clock(self, frequency):
         if not self.is_open:
             raise AttributeError("Cannot configure unopened device.")
-        if self.is_active:
+        if self.is_generating:
             raise AttributeError("Cannot configure active device.")
 
         system_frequency = c_double()
@@ -229,15 +316,37 @@ class Device:
     def start(self, channel, waveform: Waveform):
         if not self.is_open:
             raise AttributeError("Cannot configure unopened device.")
-        if self.is_active:
+        if self.is_generating:
             raise AttributeError("Cannot start active device.")
+        # The impedance analyzer drives the same output and scope channels.
+        if self.impedance is not None:
+            self.stop_impedance()
 
         clock_frequency = waveform.frequency  # Hz
 
-        # analog_buffer_size = c_int()
-        # dwf.FDwfAnalogInBufferSizeInfo(self.handle, 0, byref(analog_buffer_size))
-        # num_analog_acquisition_samples = analog_buffer_size.value
-        num_analog_acquisition_samples = 100
+        # A configuration chosen for its buffer profile sets the capture depth;
+        # otherwise keep the short default frames.
+        if self.configuration is not None:
+            num_analog_acquisition_samples = self.configuration.analog_in_buffer_size
+        else:
+            num_analog_acquisition_samples = 100
+
+        # Frames span one waveform period, so deep buffers are shortened
+        # where they would need a rate above what the scope supports.
+        analog_in_minimum_frequency = c_double()
+        analog_in_maximum_frequency = c_double()
+        dwf.FDwfAnalogInFrequencyInfo(
+            self.handle,
+            byref(analog_in_minimum_frequency),
+            byref(analog_in_maximum_frequency),
+        )
+        num_analog_acquisition_samples = max(
+            1,
+            min(
+                num_analog_acquisition_samples,
+                int(analog_in_maximum_frequency.value // clock_frequency),
+            ),
+        )
 
         analog_acquisition_frequency = (
             num_analog_acquisition_samples * clock_frequency
@@ -249,10 +358,12 @@ class Device:
 
         digital_acquisition = None
         if self.acquire_digital:
-            # digital_buffer_size = c_int()
-            # dwf.FDwfDigitalInBufferSizeInfo(self.handle, byref(digital_buffer_size))
-            # num_digital_acquisition_samples = digital_buffer_size.value
-            num_digital_acquisition_samples = 200
+            if self.configuration is not None:
+                num_digital_acquisition_samples = (
+                    self.configuration.digital_in_buffer_size
+                )
+            else:
+                num_digital_acquisition_samples = 200
 
             digital_acquisition_frequency = (num_digital_acquisition_samples // 10) * (
                 clock_frequency
@@ -290,6 +401,8 @@ class Device:
             )()
 
         while self.is_generating:
+            trace = self.tracer.begin()
+
             while True:
                 dwf.FDwfAnalogInStatus(
                     self.handle, c_int(1), byref(analog_acquisition_status)
@@ -297,6 +410,8 @@ class Device:
                 if analog_acquisition_status.value == DwfStateDone.value:
                     break
                 time.sleep(0.001)
+            self.tracer.mark(trace, "status_done")
+
             dwf.FDwfAnalogInStatusData(
                 self.handle,
                 0,
@@ -317,6 +432,8 @@ class Device:
                     num_valid_digital_acquisition_samples.value * 2,
                 )
 
+            self.tracer.mark(trace, "data_read")
+
             parsed_digital_acquisition_data = []
             if self.acquire_digital:
                 for pin in range(self.num_digital_pins):
@@ -325,9 +442,12 @@ class Device:
                         pin_data[i] = (digital_acquisition_data[i] >> pin) & 1
                     parsed_digital_acquisition_data.append(pin_data)
 
-            yield np.fromiter(
+            parsed_analog_acquisition_data = np.fromiter(
                 analog_acquisition_data, dtype=float
-            ), parsed_digital_acquisition_data
+            )
+            self.tracer.mark(trace, "parse")
+
+            yield parsed_analog_acquisition_data, parsed_digital_acquisition_data
 
     def acquire_plots(self):
         if not self.is_open:
@@ -336,51 +456,359 @@ class Device:
             raise AttributeError("Cannot acquire from inactive device.")
 
         for analog_data, digital_data in self.acquire_data():
-            figure = Figure()
+            yield render_frame(
+                self.analog_acquisition,
+                self.digital_acquisition if self.acquire_digital else None,
+                analog_data,
+                digital_data,
+            )
 
-            if self.acquire_digital:
-                subfigures = figure.subfigures(1, 2)
-                analog_figure = subfigures[0]
-                digital_figure = subfigures[1]
-            else:
-                analog_figure = figure
+    @property
+    def frame_layout(self):
+        return FrameLayout(
+            self.analog_acquisition,
+            self.digital_acquisition if self.acquire_digital else None,
+            self.num_digital_pins,
+        )
+
+    def acquire_accumulated(self, num_frames, alpha=0.1, block=False):
+        if not self.is_open:
+            raise AttributeError("Unopened device cannot acquire.")
+        if not self.is_generating:
+            raise AttributeError("Cannot acquire from inactive device.")
+
+        accumulation = Accumulation(
+            self.analog_acquisition.num_samples,
+            self.analog_acquisition.channel_range,
+            alpha,
+        )
 
-            analog_axes = analog_figure.subplots()
-            analog_axes.plot(
-                np.arange(
+        for analog_data, _ in self.acquire_data():
+            accumulation.update(analog_data)
+            if accumulation.count % num_frames == 0:
+                yield accumulation
+
+                # In block mode each result covers only the last num_frames
+                # frames instead of everything since the stream started.
+                if block:
+                    accumulation.reset()
+
+    def acquire_accumulated_plots(self, num_frames, alpha=0.1, block=False):
+        from matplotlib.figure import Figure
+
+        time_axis = np.arange(
+            0,
+            self.analog_acquisition.period,
+            1.0 / self.analog_acquisition.frequency,
+        )[: self.analog_acquisition.num_samples]
+
+        for accumulation in self.acquire_accumulated(num_frames, alpha, block):
+            figure = Figure()
+            axes = figure.subplots()
+
+            voltage_edges = accumulation.voltage_edges
+            axes.imshow(
+                accumulation.persistence,
+                origin="lower",
+                aspect="auto",
+                cmap="Greys",
+                extent=(
                     0,
                     self.analog_acquisition.period,
-                    1.0 / self.analog_acquisition.frequency,
+                    voltage_edges[0],
+                    voltage_edges[-1],
                 ),
-                analog_data,
             )
-            analog_axes.set_title("Analog")
-            analog_axes.set_xlabel("Time (seconds)")
+            axes.fill_between(
+                time_axis,
+                accumulation.minimum,
+                accumulation.maximum,
+                alpha=0.3,
+                label="Envelope",
+            )
+            axes.plot(time_axis, accumulation.mean, label="Mean")
+            axes.plot(time_axis, accumulation.exponential, label="Exponential")
+            axes.set_title(f"Analog ({accumulation.count} frames)")
+            axes.set_xlabel("Time (seconds)")
+            axes.legend(loc="upper right")
 
-            if self.acquire_digital:
-                digital_axes = digital_figure.subplots(
-                    nrows=self.num_digital_pins, ncols=1, sharex=True
+            yield figure
+
+    def spectrum(self, window="hann", segment_length=None, overlap=0.5):
+        if self.analog_acquisition is None:
+            raise AttributeError("Cannot compute spectrum of unconfigured device.")
+
+        return Spectrum(
+            self.analog_acquisition.num_samples,
+            self.analog_acquisition.frequency,
+            window,
+            segment_length,
+            overlap,
+        )
+
+    def acquire_spectra(
+        self, batch_size=8, window="hann", segment_length=None, overlap=0.5
+    ):
+        if not self.is_open:
+            raise AttributeError("Unopened device cannot acquire.")
+        if not self.is_generating:
+            raise AttributeError("Cannot acquire from inactive device.")
+
+        spectrum = self.spectrum(window, segment_length, overlap)
+
+        batch = np.empty((batch_size, self.analog_acquisition.num_samples))
+        num_batched = 0
+        for analog_data, _ in self.acquire_data():
+            batch[num_batched] = analog_data
+            num_batched += 1
+            if num_batched == batch_size:
+                spectrum.update(batch)
+                num_batched = 0
+                yield spectrum
+
+    def acquire_record(self):
+        if not self.is_open:
+            raise AttributeError("Unopened device cannot acquire.")
+        if not self.is_generating:
+            raise AttributeError("Cannot acquire from inactive device.")
+
+        channel = c_int(self.analog_acquisition.channel)
+
+        dwf.FDwfAnalogInAcquisitionModeSet(self.handle, acqmodeRecord)
+        dwf.FDwfAnalogInTriggerSourceSet(self.handle, trigsrcNone)
+        dwf.FDwfAnalogInRecordLengthSet(self.handle, c_double(0))  # Unbounded.
+        dwf.FDwfAnalogInConfigure(self.handle, c_int(0), c_int(1))
+
+        acquisition_status = c_byte()
+        num_available_samples = c_int()
+        num_lost_samples = c_int()
+        num_corrupted_samples = c_int()
+
+        record_data = (c_double * self.analog_acquisition.num_samples)()
+
+        # Corrupted samples are still part of the available data; only lost
+        # samples leave a gap in the stream.
+        num_skipped_samples = 0
+
+        try:
+            while self.is_generating:
+                dwf.FDwfAnalogInStatus(self.handle, c_int(1), byref(acquisition_status))
+                dwf.FDwfAnalogInStatusRecord(
+                    self.handle,
+                    byref(num_available_samples),
+                    byref(num_lost_samples),
+                    byref(num_corrupted_samples),
                 )
-                digital_axes[0].set_title("Digital")
-                digital_axes[-1].set_xlabel("Time (seconds)")
-                digital_figure.subplots_adjust(hspace=0)
+                num_skipped_samples += num_lost_samples.value
 
-                for axis in digital_axes:
-                    axis.set_xlim(0, self.digital_acquisition.period)
-                    axis.set_ylim(-0.1, 1.1)
-                    axis.get_yaxis().set_visible(False)
+                if num_available_samples.value == 0:
+                    time.sleep(0.001)
+                    continue
 
-                for pin in range(self.num_digital_pins):
-                    digital_axes[pin].plot(
-                        np.arange(
-                            0,
-                            self.digital_acquisition.period,
-                            1.0 / self.digital_acquisition.frequency,
-                        ),
-                        digital_data[-1 - pin],
-                    )
+                if num_available_samples.value > len(record_data):
+                    record_data = (c_double * num_available_samples.value)()
+                dwf.FDwfAnalogInStatusData(
+                    self.handle, channel, record_data, num_available_samples
+                )
 
-            yield figure
+                yield np.ctypeslib.as_array(record_data)[
+                    : num_available_samples.value
+                ].copy(), num_skipped_samples
+                num_skipped_samples = 0
+        finally:
+            # Put the analog input back into triggered single acquisitions so
+            # that acquire_data works again.
+            dwf.FDwfAnalogInConfigure(self.handle, c_int(0), c_int(0))
+            if self.is_generating:
+                self.configure_analog_in(self.analog_acquisition)
+
+    def acquire_segments(self, trigger: Trigger, capacity=64):
+        software_trigger = SoftwareTrigger(
+            trigger, self.analog_acquisition.frequency, capacity
+        )
+
+        for samples, num_skipped_samples in self.acquire_record():
+            if num_skipped_samples:
+                software_trigger.skip(num_skipped_samples)
+            if software_trigger.process(samples):
+                yield software_trigger
+
+    def acquire_transitions(self, frequency, duration, chunk_size=4096):
+        if not self.is_open:
+            raise AttributeError("Unopened device cannot acquire.")
+        # Recording reconfigures the digital input used by the frame stream.
+        if self.is_generating:
+            raise AttributeError("Cannot record transitions while generating.")
+
+        digital_in_system_frequency = c_double()
+        dwf.FDwfDigitalInInternalClockInfo(
+            self.handle, byref(digital_in_system_frequency)
+        )
+
+        dwf.FDwfDigitalInAcquisitionModeSet(self.handle, acqmodeRecord)
+        dwf.FDwfDigitalInDividerSet(
+            self.handle,
+            c_int(max(1, int(digital_in_system_frequency.value) // int(frequency))),
+        )
+        # Record at the rate the divider actually gives.
+        digital_in_divider = c_int()
+        dwf.FDwfDigitalInDividerGet(self.handle, byref(digital_in_divider))
+        frequency = digital_in_system_frequency.value / digital_in_divider.value
+        num_samples = int(frequency * duration)
+
+        dwf.FDwfDigitalInSampleFormatSet(self.handle, c_int(16))
+        dwf.FDwfDigitalInTriggerSourceSet(self.handle, trigsrcNone)
+        dwf.FDwfDigitalInTriggerPositionSet(self.handle, c_int(num_samples))
+        dwf.FDwfDigitalInConfigure(self.handle, c_bool(0), c_bool(1))
+
+        record = TransitionRecord(frequency)
+
+        acquisition_status = c_byte()
+        num_available_samples = c_int()
+        num_lost_samples = c_int()
+        num_corrupted_samples = c_int()
+
+        record_data = (c_uint16 * chunk_size)()
+
+        try:
+            while record.num_samples < num_samples:
+                dwf.FDwfDigitalInStatus(
+                    self.handle, c_int(1), byref(acquisition_status)
+                )
+                dwf.FDwfDigitalInStatusRecord(
+                    self.handle,
+                    byref(num_available_samples),
+                    byref(num_lost_samples),
+                    byref(num_corrupted_samples),
+                )
+
+                record.skip(num_lost_samples.value)
+                if num_available_samples.value == 0:
+                    if acquisition_status.value == DwfStateDone.value:
+                        break
+                    time.sleep(0.001)
+                    continue
+
+                if num_available_samples.value > len(record_data):
+                    record_data = (c_uint16 * num_available_samples.value)()
+                dwf.FDwfDigitalInStatusData(
+                    self.handle, record_data, num_available_samples.value * 2
+                )
+
+                # Only the transitions of each chunk are kept.
+                record.append(
+                    np.ctypeslib.as_array(record_data)[: num_available_samples.value]
+                )
+                yield record
+        finally:
+            dwf.FDwfDigitalInReset(self.handle)
+
+    def configure_impedance(self, impedance: Impedance):
+        if not self.is_open:
+            raise AttributeError("Cannot configure unopened device.")
+        if self.is_active:
+            raise AttributeError("Cannot configure active device.")
+
+        if self.impedance == impedance:
+            return
+
+        dwf.FDwfAnalogImpedanceReset(self.handle)
+        dwf.FDwfAnalogImpedanceModeSet(self.handle, c_int(impedance.mode))
+        dwf.FDwfAnalogImpedanceReferenceSet(self.handle, c_double(impedance.reference))
+        dwf.FDwfAnalogImpedanceAmplitudeSet(self.handle, c_double(impedance.amplitude))
+        dwf.FDwfAnalogImpedanceOffsetSet(self.handle, c_double(impedance.offset))
+        dwf.FDwfAnalogImpedanceConfigure(self.handle, c_int(1))
+
+        self.impedance = impedance
+
+    def measure_impedance(self, frequencies, measurements, compensation=None):
+        values = np.empty((len(frequencies), len(measurements)))
+
+        impedance_status = c_byte()
+        value = c_double()
+        for step, frequency in enumerate(frequencies):
+            dwf.FDwfAnalogImpedanceFrequencySet(self.handle, c_double(frequency))
+            if compensation is not None:
+                dwf.FDwfAnalogImpedanceCompensationSet(
+                    self.handle,
+                    *(c_double(parameter[step]) for parameter in compensation),
+                )
+            time.sleep(self.impedance.settle_time)
+
+            # Discard the capture that was in flight when the frequency changed.
+            dwf.FDwfAnalogImpedanceStatus(self.handle, None)
+            while True:
+                dwf.FDwfAnalogImpedanceStatus(self.handle, byref(impedance_status))
+                if impedance_status.value == DwfStateDone.value:
+                    break
+                time.sleep(0.001)
+
+            # Every quantity is derived from the same capture, so reading
+            # them costs no further device round trips.
+            for column, measurement in enumerate(measurements):
+                dwf.FDwfAnalogImpedanceStatusMeasure(
+                    self.handle, measurement, byref(value)
+                )
+                values[step, column] = value.value
+
+        return values
+
+    def measure_compensation(
+        self, kind, frequencies, impedance=Impedance(), refresh=False
+    ):
+        if kind not in COMPENSATIONS:
+            raise ValueError(f"Unknown compensation {kind!r}.")
+
+        grid = frequency_grid(frequencies)
+        compensations = self.impedance_compensations.setdefault((impedance, grid), {})
+        if refresh or kind not in compensations:
+            self.configure_impedance(impedance)
+            dwf.FDwfAnalogImpedanceCompensationReset(self.handle)
+
+            values = self.measure_impedance(
+                grid, (DwfAnalogImpedanceResistance, DwfAnalogImpedanceReactance)
+            )
+            compensations[kind] = (values[:, 0], values[:, 1])
+
+        return compensations[kind]
+
+    def impedance_sweep(
+        self,
+        frequencies,
+        measurements=("impedance", "impedance_phase"),
+        impedance=Impedance(),
+    ):
+        dtype = sweep_dtype(measurements)
+        grid = frequency_grid(frequencies)
+
+        self.configure_impedance(impedance)
+
+        # Open/short compensation is applied once both have been measured for
+        # this frequency grid and configuration.
+        compensations = self.impedance_compensations.get((impedance, grid), {})
+        compensation = None
+        if all(kind in compensations for kind in COMPENSATIONS):
+            compensation = (*compensations["open"], *compensations["short"])
+        else:
+            dwf.FDwfAnalogImpedanceCompensationReset(self.handle)
+
+        values = self.measure_impedance(
+            grid,
+            [MEASUREMENTS[measurement] for measurement in measurements],
+            compensation,
+        )
+
+        sweep = np.empty(len(grid), dtype=dtype)
+        sweep["frequency"] = grid
+        for column, measurement in enumerate(measurements):
+            sweep[measurement] = values[:, column]
+        return sweep
+
+    def stop_impedance(self):
+        if self.impedance is None:
+            raise AttributeError("Impedance analyzer not running.")
+        dwf.FDwfAnalogImpedanceConfigure(self.handle, c_int(0))
+        self.impedance = None
 
     def start_pulsing(self, pulse: Pulse):
         if not self.is_open:
@@ -420,7 +848,9 @@ class Device:
         if not self.is_generating:
             raise AttributeError("Cannot stop inactive device.")
 
+        # Resetting the digital outputs also ends any pulse.
         dwf.FDwfDigitalOutReset(self.handle)
+        self.is_pulsing = False
         dwf.FDwfAnalogOutReset(self.handle, c_int(self.analog_acquisition.channel))
 
         if self.acquire_digital:
@@ -434,16 +864,34 @@ class Device:
             raise AttributeError("Device already closed.")
         dwf.FDwfDeviceClose(self.handle)
         self.is_open = False
+        self.impedance = None
 
 
 class Devices:
-    def __init__(self):
-        self.available = []
+    def __init__(self, ttl=5.0):
+        self.ttl = ttl
+
+        self._available = []
         self.active_index = None
+        self.loaded_at = None
 
-        self.load()
+    @property
+    def available(self):
+        if self.loaded_at is None:
+            self.load()
+        return self._available
+
+    def load(self, refresh=False):
+        if (
+            not refresh
+            and self.loaded_at is not None
+            and time.monotonic() - self.loaded_at < self.ttl
+        ):
+            return
+
+        active = self.active if self.active_index is not None else None
+        known = {device.serial: device for device in self._available}
 
-    def load(self):
         devices = []
 
         num_devices = c_int()
@@ -454,8 +902,17 @@ class Devices:
         identifier = c_int()
         revision = c_int()
         for index in range(num_devices.value):
-            dwf.FDwfEnumDeviceName(c_int(index), name)
             dwf.FDwfEnumSN(c_int(index), serial)
+
+            # Devices are matched by serial so that open handles survive a
+            # refresh even if the enumeration order changes.
+            device = known.get(serial.value.decode()[3:])
+            if device is not None:
+                device.index = index
+                devices.append(device)
+                continue
+
+            dwf.FDwfEnumDeviceName(c_int(index), name)
             dwf.FDwfEnumDeviceType(c_int(index), byref(identifier), byref(revision))
             devices.append(
                 Device(
@@ -464,15 +921,73 @@ class Devices:
                     serial.value.decode()[3:],
                     identifier.value,
                     revision.value,
+                    self.load_configurations(index),
                 )
             )
 
-        self.available = devices
+        if active is not None and not any(device is active for device in devices):
+            if active.is_open:
+                devices.append(active)
+            else:
+                active = None
+
+        self._available = devices
         self.active_index = None
+        if active is not None:
+            self.active_index = next(
+                position for position, device in enumerate(devices) if device is active
+            )
 
-    def activate(self, device_index):
+        self.loaded_at = time.monotonic()
+
+    @staticmethod
+    def load_configurations(device_index):
+        configurations = []
+
+        num_configurations = c_int()
+        dwf.FDwfEnumConfig(c_int(device_index), byref(num_configurations))
+
+        value = c_int()
+        for index in range(num_configurations.value):
+            info = []
+            for constant in (
+                DECIAnalogInChannelCount,
+                DECIAnalogOutChannelCount,
+                DECIAnalogIOChannelCount,
+                DECIDigitalInChannelCount,
+                DECIDigitalOutChannelCount,
+                DECIDigitalIOChannelCount,
+                DECIAnalogInBufferSize,
+                DECIAnalogOutBufferSize,
+                DECIDigitalInBufferSize,
+                DECIDigitalOutBufferSize,
+            ):
+                dwf.FDwfEnumConfigInfo(c_int(index), constant, byref(value))
+                info.append(value.value)
+            configurations.append(Configuration(index, *info))
+
+        return configurations
+
+    def activate(self, device_index, profile=None):
+        device = self.available[device_index]
+
+        configuration = None
+        if profile is not None:
+            if not device.configurations:
+                device.configurations = self.load_configurations(device.index)
+            configuration = device.select_configuration(profile)
+
+        device.open(configuration)
         self.active_index = device_index
-        self.active.open()
+
+    def attach(self, device: Device):
+        # Activates a device that does not come from enumeration, such as a
+        # replayed capture. It is dropped on the next reload once closed. The
+        # current device is closed first so its handle is not left open.
+        self.deactivate()
+        device.open()
+        self._available.append(device)
+        self.active_index = len(self._available) - 1
 
     def deactivate(self):
         if self.active_index is not None:
@@ -483,7 +998,8 @@ class Devices:
     def active(self):
         if self.active_index is None:
             raise AttributeError("No device has been activated.")
-        return self.available[self.active_index]
+        return self._available[self.active_index]
 
     def close(self):
-        dwf.FDwfDeviceCloseAll()
+        if dwf.loaded:
+            dwf.FDwfDeviceCloseAll()
@@ -0,0 +1,199 @@
+from typing import Optional
+
+import io
+import os
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+
+def render_frame(analog_acquisition, digital_acquisition, analog_data, digital_data):
+    from matplotlib.figure import Figure
+
+    figure = Figure()
+
+    if digital_acquisition:
+        subfigures = figure.subfigures(1, 2)
+        analog_figure = subfigures[0]
+        digital_figure = subfigures[1]
+    else:
+        analog_figure = figure
+
+    analog_axes = analog_figure.subplots()
+    analog_axes.plot(
+        np.arange(
+            0,
+            analog_acquisition.period,
+            1.0 / analog_acquisition.frequency,
+        ),
+        analog_data,
+    )
+    analog_axes.set_title("Analog")
+    analog_axes.set_xlabel("Time (seconds)")
+
+    if digital_acquisition:
+        num_digital_pins = len(digital_data)
+
+        digital_axes = digital_figure.subplots(
+            nrows=num_digital_pins, ncols=1, sharex=True
+        )
+        digital_axes[0].set_title("Digital")
+        digital_axes[-1].set_xlabel("Time (seconds)")
+        digital_figure.subplots_adjust(hspace=0)
+
+        for axis in digital_axes:
+            axis.set_xlim(0, digital_acquisition.period)
+            axis.set_ylim(-0.1, 1.1)
+            axis.get_yaxis().set_visible(False)
+
+        for pin in range(num_digital_pins):
+            digital_axes[pin].plot(
+                np.arange(
+                    0,
+                    digital_acquisition.period,
+                    1.0 / digital_acquisition.frequency,
+                ),
+                digital_data[-1 - pin],
+            )
+
+    return figure
+
+
+def encode_svg(figure):
+    image = io.BytesIO()
+    figure.savefig(image, format="svg")
+    return image.getvalue()
+
+
+@dataclass(frozen=True)
+class FrameLayout:
+    analog_acquisition: object
+    digital_acquisition: Optional[object]
+    num_digital_pins: int
+
+    @property
+    def analog_shape(self):
+        return (self.analog_acquisition.num_samples,)
+
+    @property
+    def digital_shape(self):
+        if self.digital_acquisition is None:
+            return (0, 0)
+        return (self.num_digital_pins, self.digital_acquisition.num_samples)
+
+    @property
+    def nbytes(self):
+        num_values = np.prod(self.analog_shape) + np.prod(self.digital_shape)
+        return int(num_values) * np.dtype(float).itemsize
+
+    def views(self, buffer):
+        analog_size = int(np.prod(self.analog_shape))
+        data = np.ndarray(
+            analog_size + int(np.prod(self.digital_shape)), dtype=float, buffer=buffer
+        )
+        return (
+            data[:analog_size].reshape(self.analog_shape),
+            data[analog_size:].reshape(self.digital_shape),
+        )
+
+
+def encode_shared_frame(name, layout: FrameLayout):
+    shared_memory = SharedMemory(name=name)
+    try:
+        analog_data, digital_data = layout.views(shared_memory.buf)
+        svg = encode_svg(
+            render_frame(
+                layout.analog_acquisition,
+                layout.digital_acquisition,
+                analog_data,
+                digital_data,
+            )
+        )
+        # Views must be released before the block can be closed.
+        del analog_data, digital_data
+        return svg
+    finally:
+        shared_memory.close()
+
+
+def warm_up():
+    import matplotlib.figure
+
+
+class FrameEncoder:
+    def __init__(self, num_workers=None, max_in_flight=None):
+        self.num_workers = num_workers or os.cpu_count() or 1
+        # One frame queued beyond the workers keeps them busy without letting
+        # the stream run far ahead of what has been sent.
+        self.max_in_flight = max_in_flight or self.num_workers + 1
+
+        self.executor = ProcessPoolExecutor(
+            self.num_workers, mp_context=get_context("spawn")
+        )
+        # Start every worker and import Matplotlib now rather than on the
+        # first frames of a stream.
+        for _ in range(self.num_workers):
+            self.executor.submit(warm_up)
+
+    def encode(self, layout: FrameLayout, frames):
+        """Render and SVG-encode ``frames`` in worker processes, yielding the
+        results in frame order."""
+        slots = [
+            SharedMemory(create=True, size=max(1, layout.nbytes))
+            for _ in range(self.max_in_flight)
+        ]
+        free_slots = deque(slots)
+        pending = deque()
+
+        try:
+            for index, (analog_data, digital_data) in enumerate(frames):
+                if not free_slots:
+                    yield self._collect(pending, free_slots)
+
+                slot = free_slots.popleft()
+                analog_view, digital_view = layout.views(slot.buf)
+                analog_view[:] = analog_data
+                if layout.digital_acquisition is not None:
+                    digital_view[:] = digital_data
+                del analog_view, digital_view
+
+                pending.append(
+                    (
+                        index,
+                        slot,
+                        self.executor.submit(encode_shared_frame, slot.name, layout),
+                    )
+                )
+
+                while pending and pending[0][2].done():
+                    yield self._collect(pending, free_slots)
+
+            while pending:
+                yield self._collect(pending, free_slots)
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+            for _, _, future in pending:
+                if not future.cancelled():
+                    future.exception()
+            for slot in slots:
+                slot.close()
+                slot.unlink()
+
+    @staticmethod
+    def _collect(pending, free_slots):
+        # Frames are submitted in index order, so waiting on the oldest
+        # submission re-orders out-of-order completions.
+        index, slot, future = pending.popleft()
+        try:
+            return index, future.result()
+        finally:
+            free_slots.append(slot)
+
+    def shutdown(self):
+        self.executor.shutdown(cancel_futures=True)
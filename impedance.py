@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from dwfconstants import (
+    DwfAnalogImpedanceImpedance,
+    DwfAnalogImpedanceImpedancePhase,
+    DwfAnalogImpedanceResistance,
+    DwfAnalogImpedanceReactance,
+    DwfAnalogImpedanceAdmittance,
+    DwfAnalogImpedanceAdmittancePhase,
+    DwfAnalogImpedanceConductance,
+    DwfAnalogImpedanceSusceptance,
+    DwfAnalogImpedanceSeriesCapacitance,
+    DwfAnalogImpedanceParallelCapacitance,
+    DwfAnalogImpedanceSeriesInductance,
+    DwfAnalogImpedanceParallelInductance,
+    DwfAnalogImpedanceDissipation,
+    DwfAnalogImpedanceQuality,
+    DwfAnalogImpedanceVrms,
+    DwfAnalogImpedanceVreal,
+    DwfAnalogImpedanceVimag,
+    DwfAnalogImpedanceIrms,
+    DwfAnalogImpedanceIreal,
+    DwfAnalogImpedanceIimag,
+)
+
+
+MEASUREMENTS = {
+    "impedance": DwfAnalogImpedanceImpedance,
+    "impedance_phase": DwfAnalogImpedanceImpedancePhase,
+    "resistance": DwfAnalogImpedanceResistance,
+    "reactance": DwfAnalogImpedanceReactance,
+    "admittance": DwfAnalogImpedanceAdmittance,
+    "admittance_phase": DwfAnalogImpedanceAdmittancePhase,
+    "conductance": DwfAnalogImpedanceConductance,
+    "susceptance": DwfAnalogImpedanceSusceptance,
+    "series_capacitance": DwfAnalogImpedanceSeriesCapacitance,
+    "parallel_capacitance": DwfAnalogImpedanceParallelCapacitance,
+    "series_inductance": DwfAnalogImpedanceSeriesInductance,
+    "parallel_inductance": DwfAnalogImpedanceParallelInductance,
+    "dissipation": DwfAnalogImpedanceDissipation,
+    "quality": DwfAnalogImpedanceQuality,
+    "voltage_rms": DwfAnalogImpedanceVrms,
+    "voltage_real": DwfAnalogImpedanceVreal,
+    "voltage_imaginary": DwfAnalogImpedanceVimag,
+    "current_rms": DwfAnalogImpedanceIrms,
+    "current_real": DwfAnalogImpedanceIreal,
+    "current_imaginary": DwfAnalogImpedanceIimag,
+}
+
+COMPENSATIONS = ("open", "short")
+
+
+@dataclass(frozen=True)
+class Impedance:
+    mode: int = 0  # W1-C1-DUT-C2-R-GND
+    reference: float = 1000.0  # Ohms
+    amplitude: float = 0.5
+    offset: float = 0.0
+    settle_time: float = 0.01
+
+
+def frequency_grid(frequencies):
+    return tuple(float(frequency) for frequency in frequencies)
+
+
+def sweep_dtype(measurements):
+    unknown = set(measurements) - MEASUREMENTS.keys()
+    if unknown:
+        raise ValueError(f"Unknown impedance measurements {sorted(unknown)}.")
+
+    return np.dtype(
+        [("frequency", float)] + [(measurement, float) for measurement in measurements]
+    )
@@ -0,0 +1,157 @@
+import json
+import time
+
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+import numpy as np
+
+from device import Device, AnalogAcquisition, DigitalAcquisition
+from compression import pack_words, unpack_words
+
+
+def record_capture(device: Device, path, num_frames):
+    """Save ``num_frames`` frames from ``device`` as a replayable capture."""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    analog_acquisition = device.analog_acquisition
+    digital_acquisition = device.digital_acquisition if device.acquire_digital else None
+
+    analog = np.lib.format.open_memmap(
+        path / "analog.npy",
+        mode="w+",
+        dtype=float,
+        shape=(num_frames, analog_acquisition.num_samples),
+    )
+    if digital_acquisition is not None:
+        digital = np.lib.format.open_memmap(
+            path / "digital.npy",
+            mode="w+",
+            dtype=np.uint16,
+            shape=(num_frames, digital_acquisition.num_samples),
+        )
+    timestamps = np.zeros(num_frames)
+
+    frames = device.acquire_data()
+    try:
+        started = time.monotonic()
+        for index in range(num_frames):
+            analog_data, digital_data = next(frames)
+            timestamps[index] = time.monotonic() - started
+            analog[index] = analog_data
+            if digital_acquisition is not None:
+                digital[index] = pack_words(digital_data)
+    finally:
+        frames.close()
+
+    analog.flush()
+    if digital_acquisition is not None:
+        digital.flush()
+    np.save(path / "timestamps.npy", timestamps)
+
+    with open(path / "metadata.json", "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "analog_acquisition": asdict(analog_acquisition),
+                "digital_acquisition": (
+                    asdict(digital_acquisition) if digital_acquisition else None
+                ),
+                "num_digital_pins": device.num_digital_pins,
+            },
+            file,
+        )
+
+
+@dataclass
+class ReplayDevice(Device):
+    path: str = ""
+    rate: float = 1.0  # Playback speed; 0 replays as fast as possible.
+    loop: bool = False
+
+    def __post_init__(self):
+        super().__post_init__()
+
+        path = Path(self.path)
+        with open(path / "metadata.json", encoding="utf-8") as file:
+            metadata = json.load(file)
+
+        self.analog_acquisition = AnalogAcquisition(**metadata["analog_acquisition"])
+        if metadata["digital_acquisition"] is not None:
+            self.digital_acquisition = DigitalAcquisition(
+                **metadata["digital_acquisition"]
+            )
+        self.acquire_digital = self.digital_acquisition is not None
+        self.num_digital_pins = metadata["num_digital_pins"]
+
+        self.analog = np.load(path / "analog.npy", mmap_mode="r")
+        self.digital = (
+            np.load(path / "digital.npy", mmap_mode="r")
+            if self.acquire_digital
+            else None
+        )
+        self.timestamps = np.load(path / "timestamps.npy")
+
+    @classmethod
+    def from_capture(cls, path, rate=1.0, loop=False):
+        return cls(-1, "Replay", str(path), 0, 0, path=str(path), rate=rate, loop=loop)
+
+    def open(self, configuration=None):
+        if self.is_open:
+            raise AttributeError("Device already open.")
+        self.is_open = True
+        self.is_generating = True
+
+    def acquire_data(self):
+        if not self.is_open:
+            raise AttributeError("Unopened device cannot acquire.")
+        if not self.is_generating:
+            raise AttributeError("Cannot acquire from inactive device.")
+
+        num_frames = len(self.timestamps)
+        while self.is_generating:
+            started = time.monotonic()
+            for index in range(num_frames):
+                if not self.is_generating:
+                    return
+
+                trace = self.tracer.begin()
+
+                if self.rate > 0:
+                    due = started + self.timestamps[index] / self.rate
+                    delay = due - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                self.tracer.mark(trace, "status_done")
+
+                analog_data = np.array(self.analog[index])
+                digital_words = (
+                    np.array(self.digital[index]) if self.acquire_digital else None
+                )
+                self.tracer.mark(trace, "data_read")
+
+                digital_data = (
+                    unpack_words(digital_words, self.num_digital_pins)
+                    if self.acquire_digital
+                    else []
+                )
+                self.tracer.mark(trace, "parse")
+
+                yield analog_data, digital_data
+
+            if not self.loop:
+                return
+
+    def start(self, channel, waveform):
+        raise AttributeError("Cannot generate from a replayed capture.")
+
+    def stop(self):
+        if not self.is_generating:
+            raise AttributeError("Cannot stop inactive device.")
+        self.is_generating = False
+
+    def close(self):
+        if not self.is_open:
+            raise AttributeError("Device already closed.")
+        self.is_generating = False
+        self.is_open = False
@@ -0,0 +1,105 @@
+from typing import Optional
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+
+WINDOWS = {
+    "rectangular": np.ones,
+    "hann": np.hanning,
+    "hamming": np.hamming,
+    "blackman": np.blackman,
+}
+
+
+@dataclass(frozen=True)
+class SpectrumPlan:
+    window: np.ndarray
+    offsets: np.ndarray
+    frequencies: np.ndarray
+    scale: np.ndarray
+
+
+@lru_cache(maxsize=32)
+def spectrum_plan(num_samples, frequency, window, segment_length, overlap):
+    if window not in WINDOWS:
+        raise ValueError(f"Unknown window {window!r}.")
+    if not 0 < segment_length <= num_samples:
+        raise ValueError(f"Segment length must be between 1 and {num_samples} samples.")
+    if not 0 <= overlap < 1:
+        raise ValueError("Overlap must be in [0, 1).")
+
+    window_data = WINDOWS[window](segment_length)
+
+    step = max(1, int(segment_length * (1 - overlap)))
+    starts = np.arange(0, num_samples - segment_length + 1, step)
+    offsets = starts[:, np.newaxis] + np.arange(segment_length)
+
+    frequencies = np.fft.rfftfreq(segment_length, 1.0 / frequency)
+
+    # One-sided power spectral density scaling (V^2/Hz); DC and Nyquist bins
+    # are not doubled.
+    scale = np.full(frequencies.size, 2.0 / (frequency * np.sum(window_data**2)))
+    scale[0] /= 2
+    if segment_length % 2 == 0:
+        scale[-1] /= 2
+
+    for array in (window_data, offsets, frequencies, scale):
+        array.setflags(write=False)
+
+    return SpectrumPlan(window_data, offsets, frequencies, scale)
+
+
+@dataclass
+class Spectrum:
+    num_samples: int
+    frequency: float
+    window: str = "hann"
+    segment_length: Optional[int] = None
+    overlap: float = 0.5
+
+    def __post_init__(self):
+        if self.segment_length is None:
+            self.segment_length = self.num_samples
+
+        self.plan = spectrum_plan(
+            self.num_samples,
+            float(self.frequency),
+            self.window,
+            self.segment_length,
+            self.overlap,
+        )
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.average = np.zeros(self.plan.frequencies.size)
+
+    @property
+    def frequencies(self):
+        return self.plan.frequencies
+
+    @property
+    def magnitude(self):
+        # Amplitude spectral density (V/sqrt(Hz)).
+        return np.sqrt(self.average)
+
+    def update(self, frames):
+        frames = np.asarray(frames, dtype=float)
+        if frames.ndim == 1:
+            frames = frames[np.newaxis]
+        if frames.shape[1] != self.num_samples:
+            raise ValueError(
+                f"Expected frames of {self.num_samples} samples, got {frames.shape[1]}."
+            )
+
+        segments = frames[:, self.plan.offsets] * self.plan.window
+        power = np.abs(np.fft.rfft(segments, axis=-1)) ** 2
+        power = power.reshape(-1, self.plan.frequencies.size) * self.plan.scale
+
+        # Welch average over every segment seen so far.
+        num_segments = power.shape[0]
+        self.count += num_segments
+        self.average += (power.sum(axis=0) - num_segments * self.average) / self.count
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from compression import (
+    HEADER,
+    ANALOG_RAW,
+    ANALOG_KEY,
+    ANALOG_DELTA,
+    ANALOG_LEVELS,
+    DIGITAL_NONE,
+    DIGITAL_RAW,
+    DIGITAL_RLE,
+    DIGITAL_XOR_RLE,
+    FrameCompressor,
+    FrameDecompressor,
+)
+
+CHANNEL_RANGE = 5.0
+TOLERANCE = CHANNEL_RANGE / ANALOG_LEVELS
+
+NUM_SAMPLES = 1000
+
+
+def encodings(frame):
+    _, analog_encoding, digital_encoding, *_ = HEADER.unpack_from(frame)
+    return analog_encoding, digital_encoding
+
+
+def sine(phase=0.0):
+    return 2 * np.sin(np.linspace(0, 4 * np.pi, NUM_SAMPLES) + phase)
+
+
+def square(shift=0):
+    return np.roll(np.repeat(np.array([0, 3, 1, 2], dtype=np.uint16), 250), shift)
+
+
+def test_analog_key_then_delta():
+    compressor = FrameCompressor(CHANNEL_RANGE)
+    decompressor = FrameDecompressor()
+
+    for phase, expected in [
+        (0.0, ANALOG_KEY),
+        (0.1, ANALOG_DELTA),
+        (0.2, ANALOG_DELTA),
+    ]:
+        analog_data = sine(phase)
+        frame = compressor.encode(analog_data)
+        assert encodings(frame) == (expected, DIGITAL_NONE)
+
+        decoded, digital_words = decompressor.decode(frame)
+        np.testing.assert_allclose(decoded, analog_data, atol=TOLERANCE)
+        assert digital_words is None
+
+
+def test_analog_raw_fallback_resets_reference():
+    compressor = FrameCompressor(CHANNEL_RANGE)
+    decompressor = FrameDecompressor()
+
+    # Two samples do not compress below their float32 size.
+    analog_data = np.array([0.5, -1.25])
+    frame = compressor.encode(analog_data)
+    assert encodings(frame)[0] == ANALOG_RAW
+    np.testing.assert_array_equal(decompressor.decode(frame)[0], analog_data)
+
+    frame = compressor.encode(sine())
+    assert encodings(frame)[0] == ANALOG_KEY
+    np.testing.assert_allclose(decompressor.decode(frame)[0], sine(), atol=TOLERANCE)
+
+
+def test_digital_rle_then_xor():
+    compressor = FrameCompressor(CHANNEL_RANGE)
+    decompressor = FrameDecompressor()
+
+    for shift, expected in [(0, DIGITAL_RLE), (10, DIGITAL_XOR_RLE)]:
+        digital_words = square(shift)
+        frame = compressor.encode(sine(), digital_words)
+        assert encodings(frame)[1] == expected
+
+        _, decoded = decompressor.decode(frame)
+        np.testing.assert_array_equal(decoded, digital_words)
+
+
+def test_digital_raw_fallback_resets_reference():
+    compressor = FrameCompressor(CHANNEL_RANGE)
+    decompressor = FrameDecompressor()
+
+    # Words that change on every sample take more space as runs.
+    digital_words = np.arange(NUM_SAMPLES, dtype=np.uint16)
+    frame = compressor.encode(sine(), digital_words)
+    assert encodings(frame)[1] == DIGITAL_RAW
+    np.testing.assert_array_equal(decompressor.decode(frame)[1], digital_words)
+
+    frame = compressor.encode(sine(), square())
+    assert encodings(frame)[1] == DIGITAL_RLE
+    np.testing.assert_array_equal(decompressor.decode(frame)[1], square())
+
+
+def test_delta_without_reference_is_rejected():
+    compressor = FrameCompressor(CHANNEL_RANGE)
+    compressor.encode(sine(), square())
+    frame = compressor.encode(sine(0.1), square(10))
+    assert encodings(frame) == (ANALOG_DELTA, DIGITAL_XOR_RLE)
+
+    with pytest.raises(ValueError):
+        FrameDecompressor().decode(frame)
@@ -0,0 +1,28 @@
+import subprocess
+import sys
+import time
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+IMPORT_BUDGET = 2.0  # seconds
+
+CHECK_IMPORT = """
+import sys
+
+import app
+from utils import dwf
+
+assert "matplotlib" not in sys.modules, "matplotlib imported at startup"
+assert not dwf.loaded, "DWF library loaded at startup"
+assert app.devices.loaded_at is None, "devices enumerated at startup"
+"""
+
+
+def test_import_is_lazy():
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", CHECK_IMPORT], cwd=ROOT, check=True)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < IMPORT_BUDGET, f"importing app took {elapsed:.2f} s"
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from transitions import TransitionRecord
+
+FREQUENCY = 1000  # Hz, so one sample is 1 ms
+
+CHUNK_SIZES = (1, 3, 7, 50, 1000)
+
+
+def run_length_stream(seed=0, num_runs=40):
+    generator = np.random.default_rng(seed)
+    values = generator.integers(0, 4, num_runs).astype(np.uint16)
+    counts = generator.integers(1, 20, num_runs)
+    return np.repeat(values, counts)
+
+
+def record_chunks(words, chunk_size, capacity=1):
+    record = TransitionRecord(FREQUENCY, capacity)
+    for start in range(0, words.size, chunk_size):
+        record.append(words[start : start + chunk_size])
+    return record
+
+
+def test_append_keeps_only_transitions():
+    words = np.array([1, 1, 1, 2, 2, 0, 0, 0, 0, 3], dtype=np.uint16)
+
+    for chunk_size in CHUNK_SIZES:
+        record = record_chunks(words, chunk_size)
+        np.testing.assert_array_equal(record.indices, [0, 3, 5, 9])
+        np.testing.assert_array_equal(record.words, [1, 2, 0, 3])
+        assert record.num_samples == words.size
+
+
+def test_reconstruct_round_trip():
+    words = run_length_stream()
+
+    for chunk_size in CHUNK_SIZES:
+        record = record_chunks(words, chunk_size)
+        np.testing.assert_array_equal(
+            record.reconstruct(0, words.size / FREQUENCY), words
+        )
+        assert record.duration == words.size / FREQUENCY
+
+
+def test_reconstruct_across_gap():
+    first = run_length_stream(1)
+    second = run_length_stream(2)
+
+    record = record_chunks(first, 7)
+    record.skip(25)
+    for start in range(0, second.size, 7):
+        record.append(second[start : start + 7])
+
+    # The last word before the gap is assumed to hold through it.
+    expected = np.concatenate((first, np.full(25, first[-1]), second))
+    np.testing.assert_array_equal(record.reconstruct(0, record.duration), expected)
+    assert record.num_samples == expected.size
+
+
+def test_word_at():
+    words = np.array([1, 1, 2, 2, 2, 3], dtype=np.uint16)
+    record = record_chunks(words, 2)
+
+    for index, word in enumerate(words):
+        assert record.word_at(index / FREQUENCY) == word
+    with pytest.raises(ValueError):
+        record.word_at(-1 / FREQUENCY)
+
+
+def test_window():
+    words = np.array([1, 1, 2, 2, 2, 3, 3, 0], dtype=np.uint16)
+    record = record_chunks(words, 3)
+
+    times, window_words = record.window(1 / FREQUENCY, 7 / FREQUENCY)
+    np.testing.assert_allclose(times, np.array([1, 2, 5]) / FREQUENCY)
+    np.testing.assert_array_equal(window_words, [1, 2, 3])
+
+
+def test_save_load_round_trip(tmp_path):
+    words = run_length_stream()
+    record = record_chunks(words, 50)
+    record.skip(10)
+    record.append(words[:30])
+
+    path = tmp_path / "transitions.npz"
+    record.save(path)
+    loaded = TransitionRecord.load(path)
+
+    assert loaded.frequency == record.frequency
+    assert loaded.num_samples == record.num_samples
+    np.testing.assert_array_equal(loaded.indices, record.indices)
+    np.testing.assert_array_equal(loaded.words, record.words)
+    np.testing.assert_array_equal(
+        loaded.reconstruct(0, loaded.duration), record.reconstruct(0, record.duration)
+    )
@@ -0,0 +1,189 @@
+import time
+
+import numpy as np
+import pytest
+
+from dwfconstants import (
+    trigtypePulse,
+    trigtypeTransition,
+    trigtypeWindow,
+    DwfTriggerSlopeRise,
+    DwfTriggerSlopeFall,
+    DwfTriggerSlopeEither,
+    triglenLess,
+    triglenTimeout,
+    triglenMore,
+)
+from trigger import Trigger, SoftwareTrigger
+
+FREQUENCY = 1000  # Hz, so one sample is 1 ms
+
+NUM_PRE_SAMPLES = 2
+NUM_POST_SAMPLES = 3
+
+CHUNK_SIZES = (None, 1, 3, 7, 50)
+
+
+def signal(*pieces):
+    """Concatenate (value, count) pieces into a sample array."""
+    return np.concatenate(
+        [np.full(count, value, dtype=float) for value, count in pieces]
+    )
+
+
+def make_trigger(**settings):
+    settings.setdefault("position", NUM_PRE_SAMPLES / FREQUENCY)
+    settings.setdefault("duration", NUM_POST_SAMPLES / FREQUENCY)
+    return Trigger(**settings)
+
+
+def chunks(samples, chunk_size):
+    if chunk_size is None:
+        return [samples]
+    return [
+        samples[start : start + chunk_size]
+        for start in range(0, samples.size, chunk_size)
+    ]
+
+
+def run(trigger, samples, chunk_size=None, capacity=256):
+    software_trigger = SoftwareTrigger(trigger, FREQUENCY, capacity)
+    num_captured = sum(
+        software_trigger.process(chunk) for chunk in chunks(samples, chunk_size)
+    )
+    assert num_captured == software_trigger.num_segments
+    return software_trigger.latest()
+
+
+def assert_triggers(trigger, samples, expected):
+    for chunk_size in CHUNK_SIZES:
+        indices, segments = run(trigger, samples, chunk_size)
+        np.testing.assert_array_equal(indices, expected, err_msg=f"{chunk_size=}")
+        for index, segment in zip(indices, segments):
+            np.testing.assert_array_equal(
+                segment,
+                samples[index - NUM_PRE_SAMPLES : index + NUM_POST_SAMPLES],
+            )
+
+
+def test_edge_slopes():
+    samples = signal((-1, 10), (1, 10), (-1, 10), (1, 10), (-1, 10))
+
+    assert_triggers(make_trigger(), samples, [10, 30])
+    assert_triggers(
+        make_trigger(condition=DwfTriggerSlopeFall.value), samples, [20, 40]
+    )
+    assert_triggers(
+        make_trigger(condition=DwfTriggerSlopeEither.value), samples, [10, 20, 30, 40]
+    )
+
+
+def test_edge_hysteresis():
+    samples = signal(
+        (-1, 10), (0.05, 1), (-0.05, 1), (0.05, 1), (-0.05, 1), (1, 10), (-1, 10)
+    )
+
+    assert_triggers(make_trigger(), samples, [10, 12, 14])
+    assert_triggers(make_trigger(hysteresis=0.2), samples, [14])
+
+
+def test_pulse_lengths():
+    # High pulses of 3, 8 and 20 samples.
+    samples = signal((-1, 10), (1, 3), (-1, 10), (1, 8), (-1, 10), (1, 20), (-1, 10))
+
+    def pulse(length_condition, length, condition=DwfTriggerSlopeRise.value):
+        return make_trigger(
+            type=trigtypePulse.value,
+            condition=condition,
+            length=length / FREQUENCY,
+            length_condition=length_condition,
+        )
+
+    assert_triggers(pulse(triglenLess.value, 5), samples, [13])
+    assert_triggers(pulse(triglenMore.value, 5), samples, [31, 61])
+    assert_triggers(pulse(triglenTimeout.value, 10), samples, [51])
+    # Low pulses between the high ones are all 10 samples long; the leading
+    # low level has no observed start.
+    assert_triggers(
+        pulse(triglenMore.value, 9, DwfTriggerSlopeFall.value), samples, [23, 41]
+    )
+
+
+def test_window():
+    samples = signal((0, 10), (1, 10), (2, 10), (1, 10), (0, 10))
+
+    def window(condition):
+        return make_trigger(
+            type=trigtypeWindow.value, condition=condition, level=0.5, upper_level=1.5
+        )
+
+    assert_triggers(window(DwfTriggerSlopeRise.value), samples, [10, 30])
+    assert_triggers(window(DwfTriggerSlopeFall.value), samples, [20, 40])
+
+
+def test_holdoff():
+    samples = np.tile(signal((-1, 10), (1, 10)), 5)
+
+    assert_triggers(make_trigger(), samples, [10, 30, 50, 70, 90])
+    assert_triggers(make_trigger(holdoff=25 / FREQUENCY), samples, [10, 50, 90])
+
+
+def test_pre_trigger_window_must_be_available():
+    samples = signal((-1, 1), (1, 10), (-1, 10), (1, 10))
+
+    assert_triggers(make_trigger(), samples, [21])
+
+
+def test_skip_keeps_indices_aligned():
+    first = signal((-1, 10), (1, 10), (-1, 10), (1, 2))
+    second = signal((1, 5), (-1, 10), (1, 10))
+
+    software_trigger = SoftwareTrigger(make_trigger(), FREQUENCY)
+    software_trigger.process(first)
+    software_trigger.skip(100)
+    software_trigger.process(second)
+
+    # The rise 2 samples before the gap cannot complete its segment, and the
+    # high level after the gap is not an edge.
+    indices, segments = software_trigger.latest()
+    np.testing.assert_array_equal(indices, [10, first.size + 100 + 15])
+    np.testing.assert_array_equal(segments[1], second[13:18])
+    assert software_trigger.num_samples == first.size + 100 + second.size
+
+
+def test_ring_keeps_latest_segments():
+    samples = np.tile(signal((-1, 10), (1, 10)), 10)
+
+    for chunk_size in CHUNK_SIZES:
+        indices, _ = run(make_trigger(), samples, chunk_size, capacity=4)
+        np.testing.assert_array_equal(indices, [130, 150, 170, 190])
+
+    software_trigger = SoftwareTrigger(make_trigger(), FREQUENCY, capacity=4)
+    software_trigger.process(samples)
+    assert software_trigger.num_segments == 10
+    indices, _ = software_trigger.latest(2)
+    np.testing.assert_array_equal(indices, [170, 190])
+
+
+def test_unsupported_trigger_type():
+    with pytest.raises(ValueError):
+        SoftwareTrigger(Trigger(type=trigtypeTransition.value), FREQUENCY)
+
+
+def test_faster_than_real_time():
+    frequency = 1_000_000
+    times = np.arange(frequency) / frequency
+    noise = np.random.default_rng(0).normal(scale=0.01, size=times.size)
+    samples = np.sin(2 * np.pi * 1000 * times) + noise
+
+    software_trigger = SoftwareTrigger(
+        Trigger(hysteresis=0.05, position=1e-4, duration=4e-4), frequency
+    )
+    started = time.perf_counter()
+    for start in range(0, samples.size, 16384):
+        software_trigger.process(samples[start : start + 16384])
+    elapsed = time.perf_counter() - started
+
+    assert software_trigger.num_segments == 999
+    # One second of samples, with a wide margin for slow machines.
+    assert elapsed < 0.5
@@ -0,0 +1,121 @@
+import os
+import json
+import time
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+STAGES = ("status_done", "data_read", "parse", "render", "send")
+
+# Log-spaced latency bins from 10 microseconds to 10 seconds.
+BIN_EDGES = np.logspace(-5, 1, 61)
+
+
+@dataclass
+class FrameTrace:
+    index: int
+    timestamps: dict = field(default_factory=dict)
+
+
+class Tracer:
+    def __init__(self, bin_edges=BIN_EDGES):
+        self.bin_edges = np.asarray(bin_edges)
+        self.reset()
+
+    def reset(self):
+        self.num_frames = 0
+        self.latest = None
+
+        self.counts = {
+            stage: np.zeros(self.bin_edges.size + 1, dtype=np.int64) for stage in STAGES
+        }
+        self.totals = dict.fromkeys(STAGES, 0.0)
+
+        self.session = None
+        self.session_path = None
+
+    def begin(self):
+        trace = FrameTrace(self.num_frames, {"start": time.monotonic()})
+        self.num_frames += 1
+        self.latest = trace
+
+        if self.session is not None:
+            self.session.append(trace)
+
+        return trace
+
+    def mark(self, trace: FrameTrace, stage):
+        if stage not in self.counts:
+            raise ValueError(f"Unknown stage {stage!r}.")
+
+        now = time.monotonic()
+        duration = now - next(reversed(trace.timestamps.values()))
+        trace.timestamps[stage] = now
+
+        # Bin 0 collects durations below the first edge, the last bin those
+        # above the final edge.
+        self.counts[stage][np.searchsorted(self.bin_edges, duration)] += 1
+        self.totals[stage] += duration
+
+    def summary(self):
+        summary = {}
+        for stage in STAGES:
+            counts = self.counts[stage]
+            num_samples = int(counts.sum())
+            if num_samples == 0:
+                continue
+
+            # Percentiles are reported as the upper edge of the bin that
+            # contains them.
+            cumulative = np.cumsum(counts)
+            upper_edges = np.append(self.bin_edges, np.inf)
+            summary[stage] = {
+                "count": num_samples,
+                "mean": self.totals[stage] / num_samples,
+                "p50": float(
+                    upper_edges[np.searchsorted(cumulative, num_samples * 0.5)]
+                ),
+                "p99": float(
+                    upper_edges[np.searchsorted(cumulative, num_samples * 0.99)]
+                ),
+                "counts": counts.tolist(),
+            }
+
+        return {"bin_edges": self.bin_edges.tolist(), "stages": summary}
+
+    def start_session(self, path):
+        self.session = []
+        self.session_path = path
+
+    def stop_session(self):
+        if self.session is None:
+            raise AttributeError("No trace session in progress.")
+
+        process = os.getpid()
+        events = []
+        for trace in self.session:
+            stages = list(trace.timestamps.items())
+            for (_, started), (stage, ended) in zip(stages, stages[1:]):
+                events.append(
+                    {
+                        "name": stage,
+                        "cat": "frame",
+                        "ph": "X",
+                        "ts": started * 1e6,
+                        "dur": (ended - started) * 1e6,
+                        "pid": process,
+                        # Frames overlap in the pipeline, so each gets its
+                        # own track.
+                        "tid": trace.index,
+                    }
+                )
+
+        with open(self.session_path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+        path = self.session_path
+        self.session = None
+        self.session_path = None
+        return path
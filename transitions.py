@@ -0,0 +1,116 @@
+import numpy as np
+
+
+class TransitionRecord:
+    """Digital capture stored as (sample index, word) pairs at each change.
+
+    Memory grows with the number of transitions rather than the capture
+    duration. Times passed to the query helpers are in seconds from the start
+    of the capture.
+    """
+
+    def __init__(self, frequency, capacity=1024):
+        self.frequency = frequency
+
+        self._indices = np.zeros(capacity, dtype=np.int64)
+        self._words = np.zeros(capacity, dtype=np.uint16)
+        self.num_transitions = 0
+        self.num_samples = 0
+
+    @property
+    def indices(self):
+        return self._indices[: self.num_transitions]
+
+    @property
+    def words(self):
+        return self._words[: self.num_transitions]
+
+    @property
+    def times(self):
+        return self.indices / self.frequency
+
+    @property
+    def duration(self):
+        return self.num_samples / self.frequency
+
+    def append(self, words):
+        words = np.asarray(words, dtype=np.uint16)
+        if words.size == 0:
+            return
+
+        changes = np.flatnonzero(words[1:] != words[:-1]) + 1
+        if (
+            self.num_transitions == 0
+            or words[0] != self._words[self.num_transitions - 1]
+        ):
+            changes = np.concatenate(([0], changes))
+
+        self._reserve(self.num_transitions + changes.size)
+        end = self.num_transitions + changes.size
+        self._indices[self.num_transitions : end] = changes + self.num_samples
+        self._words[self.num_transitions : end] = words[changes]
+        self.num_transitions = end
+
+        self.num_samples += words.size
+
+    def skip(self, num_samples):
+        # Lost samples keep their place in time; the last known word is
+        # assumed to hold across the gap.
+        self.num_samples += num_samples
+
+    def _reserve(self, capacity):
+        if capacity <= self._indices.size:
+            return
+        capacity = max(capacity, 2 * self._indices.size)
+        self._indices = np.resize(self._indices, capacity)
+        self._words = np.resize(self._words, capacity)
+
+    def _sample(self, time):
+        return int(round(time * self.frequency))
+
+    def word_at(self, time):
+        position = np.searchsorted(self.indices, self._sample(time), side="right") - 1
+        if position < 0:
+            raise ValueError(f"No samples recorded before {time} s.")
+        return int(self.words[position])
+
+    def window(self, start, stop):
+        """Return the word at ``start`` followed by every transition up to
+        ``stop``, as (times, words)."""
+        first = np.searchsorted(self.indices, self._sample(start), side="right") - 1
+        last = np.searchsorted(self.indices, self._sample(stop), side="left")
+        first = max(first, 0)
+
+        indices = self.indices[first:last].copy()
+        if indices.size:
+            indices[0] = max(indices[0], self._sample(start))
+        return indices / self.frequency, self.words[first:last].copy()
+
+    def reconstruct(self, start, stop):
+        """Expand ``[start, stop)`` back into one word per sample."""
+        samples = np.arange(
+            self._sample(start), min(self._sample(stop), self.num_samples)
+        )
+        positions = np.searchsorted(self.indices, samples, side="right") - 1
+        if positions.size and positions[0] < 0:
+            raise ValueError(f"No samples recorded before {start} s.")
+        return self.words[positions]
+
+    def save(self, path):
+        np.savez_compressed(
+            path,
+            indices=self.indices,
+            words=self.words,
+            frequency=self.frequency,
+            num_samples=self.num_samples,
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            record = cls(float(data["frequency"]), max(1, data["indices"].size))
+            record.num_transitions = data["indices"].size
+            record._indices[: record.num_transitions] = data["indices"]
+            record._words[: record.num_transitions] = data["words"]
+            record.num_samples = int(data["num_samples"])
+        return record
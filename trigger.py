@@ -0,0 +1,231 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from dwfconstants import (
+    trigtypeEdge,
+    trigtypePulse,
+    trigtypeWindow,
+    DwfTriggerSlopeRise,
+    DwfTriggerSlopeFall,
+    triglenLess,
+    triglenTimeout,
+    triglenMore,
+)
+
+
+@dataclass
+class Trigger:
+    """Software trigger condition, mirroring the DWF trigger settings.
+
+    Edge triggers fire on crossings of ``level`` (with ``hysteresis`` volts of
+    noise rejection around it). Pulse triggers measure the time spent above
+    (rise) or below (fall) ``level`` and compare it against ``length`` using
+    ``length_condition``. Window triggers fire when the signal enters (rise)
+    or exits (fall) the ``[level, upper_level]`` band.
+    """
+
+    type: int = trigtypeEdge.value
+    condition: int = DwfTriggerSlopeRise.value
+    level: float = 0.0
+    hysteresis: float = 0.0
+    upper_level: float = 0.0
+    length: float = 0.0
+    length_condition: int = triglenMore.value
+    position: float = 0.0
+    duration: float = 0.0
+    holdoff: float = 0.0
+
+
+class SoftwareTrigger:
+    def __init__(self, trigger: Trigger, frequency, capacity=64):
+        if trigger.type not in (
+            trigtypeEdge.value,
+            trigtypePulse.value,
+            trigtypeWindow.value,
+        ):
+            raise ValueError(f"Unsupported trigger type {trigger.type}.")
+
+        self.trigger = trigger
+        self.frequency = frequency
+        self.capacity = capacity
+
+        self.num_pre_samples = int(round(trigger.position * frequency))
+        self.num_post_samples = max(1, int(round(trigger.duration * frequency)))
+        self.num_holdoff_samples = int(round(trigger.holdoff * frequency))
+        self.num_length_samples = int(round(trigger.length * frequency))
+
+        self.segments = np.zeros(
+            (capacity, self.num_pre_samples + self.num_post_samples)
+        )
+        self.trigger_indices = np.zeros(capacity, dtype=np.int64)
+
+        self.reset()
+
+    def reset(self):
+        self.num_segments = 0
+
+        self._buffer = np.zeros(0)
+        self._buffer_start = 0
+        self._state = -1
+        self._pulse_starts = {
+            DwfTriggerSlopeRise.value: None,
+            DwfTriggerSlopeFall.value: None,
+        }
+        self._pending = []
+        self._armed_index = 0
+
+    @property
+    def num_samples(self):
+        return self._buffer_start + self._buffer.size
+
+    def latest(self, count=None):
+        """Return up to ``count`` captured segments, oldest first."""
+        available = min(self.num_segments, self.capacity)
+        if count is not None:
+            available = min(available, count)
+        slots = np.arange(self.num_segments - available, self.num_segments)
+        slots %= self.capacity
+        return self.trigger_indices[slots], self.segments[slots]
+
+    def skip(self, num_samples):
+        """Account for ``num_samples`` lost from the stream.
+
+        Trigger indices stay aligned with the stream, but nothing is searched
+        across the gap and pending segments that would span it are dropped.
+        """
+        self._buffer_start = self.num_samples + num_samples
+        self._buffer = np.zeros(0)
+        self._state = -1
+        self._pulse_starts = dict.fromkeys(self._pulse_starts)
+        self._pending = []
+
+    def process(self, samples):
+        """Scan a chunk of the continuous stream and return the number of new
+        segments captured."""
+        samples = np.asarray(samples, dtype=float)
+        chunk_start = self.num_samples
+
+        candidates = self._search(samples, chunk_start)
+        self._buffer = np.concatenate((self._buffer, samples))
+
+        for index in candidates:
+            if (
+                index < self._armed_index
+                or index - self.num_pre_samples < self._buffer_start
+            ):
+                continue
+            self._pending.append(index)
+            self._armed_index = index + max(1, self.num_holdoff_samples)
+
+        num_captured = 0
+        while self._pending and (
+            self._pending[0] + self.num_post_samples <= self.num_samples
+        ):
+            index = self._pending.pop(0)
+            start = index - self.num_pre_samples - self._buffer_start
+            slot = self.num_segments % self.capacity
+            self.segments[slot] = self._buffer[start : start + self.segments.shape[1]]
+            self.trigger_indices[slot] = index
+            self.num_segments += 1
+            num_captured += 1
+
+        # Retain only what pending triggers and the next pre-trigger window
+        # can still reach.
+        keep_from = self.num_samples - self.num_pre_samples
+        if self._pending:
+            keep_from = min(keep_from, self._pending[0] - self.num_pre_samples)
+        drop = max(0, keep_from - self._buffer_start)
+        if drop:
+            self._buffer = self._buffer[drop:]
+            self._buffer_start += drop
+
+        return num_captured
+
+    def _states(self, samples):
+        trigger = self.trigger
+        if trigger.type == trigtypeWindow.value:
+            return (
+                (samples >= trigger.level) & (samples <= trigger.upper_level)
+            ).astype(np.int8)
+
+        # Schmitt state: 1 above the upper threshold, 0 below the lower one,
+        # otherwise carried forward from the last decided sample.
+        upper = trigger.level + trigger.hysteresis / 2
+        lower = trigger.level - trigger.hysteresis / 2
+
+        decided = np.full(samples.size + 1, -1, dtype=np.int8)
+        decided[0] = self._state
+        decided[1:][samples >= upper] = 1
+        decided[1:][samples < lower] = 0
+
+        positions = np.where(decided >= 0, np.arange(decided.size), 0)
+        np.maximum.accumulate(positions, out=positions)
+        return decided[positions][1:]
+
+    def _search(self, samples, chunk_start):
+        if samples.size == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        states = self._states(samples)
+        previous = np.concatenate(([self._state], states[:-1]))
+        self._state = int(states[-1])
+
+        rises = np.flatnonzero((previous == 0) & (states == 1)) + chunk_start
+        falls = np.flatnonzero((previous == 1) & (states == 0)) + chunk_start
+
+        trigger = self.trigger
+        if trigger.type == trigtypePulse.value:
+            chunk_end = chunk_start + samples.size
+            candidates = []
+            if trigger.condition != DwfTriggerSlopeFall.value:
+                candidates.append(
+                    self._pulses(
+                        DwfTriggerSlopeRise.value, rises, falls, chunk_start, chunk_end
+                    )
+                )
+            if trigger.condition != DwfTriggerSlopeRise.value:
+                candidates.append(
+                    self._pulses(
+                        DwfTriggerSlopeFall.value, falls, rises, chunk_start, chunk_end
+                    )
+                )
+            return np.sort(np.concatenate(candidates))
+
+        if trigger.condition == DwfTriggerSlopeRise.value:
+            return rises
+        if trigger.condition == DwfTriggerSlopeFall.value:
+            return falls
+        return np.sort(np.concatenate((rises, falls)))
+
+    def _pulses(self, polarity, starts, ends, chunk_start, chunk_end):
+        carried = self._pulse_starts[polarity]
+        if carried is not None:
+            starts = np.concatenate(([carried], starts))
+
+        # Starts and ends alternate; an end before the first known start
+        # belongs to a pulse whose beginning was never observed.
+        if starts.size:
+            ends = ends[ends > starts[0]]
+        else:
+            ends = ends[:0]
+
+        num_closed = ends.size
+        self._pulse_starts[polarity] = (
+            int(starts[num_closed]) if starts.size > num_closed else None
+        )
+
+        widths = ends - starts[:num_closed]
+        condition = self.trigger.length_condition
+        if condition == triglenLess.value:
+            return ends[widths < self.num_length_samples]
+        if condition == triglenMore.value:
+            return ends[widths > self.num_length_samples]
+        if condition == triglenTimeout.value:
+            timeouts = starts + self.num_length_samples
+            still_high = np.ones(starts.size, dtype=bool)
+            still_high[:num_closed] = timeouts[:num_closed] < ends
+            return timeouts[
+                still_high & (timeouts >= chunk_start) & (timeouts < chunk_end)
+            ]
+        raise ValueError(f"Unsupported length condition {condition}.")
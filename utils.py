@@ -2,9 +2,30 @@ import sys
 
 from ctypes import cdll
 
-if sys.platform.startswith("win"):
-    dwf = cdll.dwf
-elif sys.platform.startswith("darwin"):
-    dwf = cdll.LoadLibrary("/Library/Frameworks/dwf.framework/dwf")
-else:
-    dwf = cdll.LoadLibrary("libdwf.so")
+
+def load_library():
+    if sys.platform.startswith("win"):
+        return cdll.dwf
+    elif sys.platform.startswith("darwin"):
+        return cdll.LoadLibrary("/Library/Frameworks/dwf.framework/dwf")
+    else:
+        return cdll.LoadLibrary("libdwf.so")
+
+
+class Library:
+    # Defers loading the DWF library until the first function lookup, so that
+    # importing the server does not touch the driver.
+    def __init__(self):
+        self._library = None
+
+    @property
+    def loaded(self):
+        return self._library is not None
+
+    def __getattr__(self, name):
+        if self._library is None:
+            self._library = load_library()
+        return getattr(self._library, name)
+
+
+dwf = Library()